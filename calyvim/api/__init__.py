@@ -1,3 +1,4 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
 from calyvim.api.accounts.views import AccountsViewSet
@@ -21,6 +22,8 @@ from calyvim.api.estimates.views import EstimatesViewSets
 from calyvim.api.sprints.views import SprintsViewSet
 from calyvim.api.documents.views import DocumentsViewSet
 from calyvim.api.blocks.views import BlocksViewst
+from calyvim.api.analytics.views import AnalyticsViewSet
+from calyvim.api.events.views import board_events
 
 router = SimpleRouter(trailing_slash=False, use_regex_path=False)
 
@@ -50,6 +53,7 @@ router.register("boards/<uuid:board_id>/permissions", BoardPermissionsViewSet, b
 router.register("boards/<uuid:board_id>/team_permissions", BoardTeamPermissionsViewSet, basename="board-team-permission")
 router.register("boards/<uuid:board_id>/estimates", EstimatesViewSets, basename="estimate")
 router.register("boards/<uuid:board_id>/sprints", SprintsViewSet, basename="sprint")
+router.register("boards/<uuid:board_id>/analytics", AnalyticsViewSet, basename="analytics")
 
 # Newslines
 router.register("newslines", NewslinesViewSet, basename="newsline")
@@ -58,4 +62,7 @@ router.register("newslines", NewslinesViewSet, basename="newsline")
 router.register("documents", DocumentsViewSet, basename="document")
 router.register("documents/<uuid:document_id>/blocks", BlocksViewst, basename="block")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    # Server-sent events, a plain async Django view outside the DRF router
+    path("boards/<uuid:board_id>/events", board_events, name="board-events"),
+]
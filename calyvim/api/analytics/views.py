@@ -0,0 +1,138 @@
+import statistics
+from datetime import timedelta
+
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.viewsets import ViewSet
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.decorators import action
+
+from calyvim.models import BoardCumulativeFlow, TaskFlowTime, State
+from calyvim.mixins import BoardMixin
+from calyvim.api.analytics.serializers import AnalyticsRangeSerializer
+from calyvim.permissions import BoardGenericPermission
+from calyvim.exceptions import InvalidInputException
+
+
+# Default reporting window when no dates are given
+ANALYTICS_DEFAULT_DAYS = 30
+
+# Longest reporting window, one label is returned per day
+ANALYTICS_MAX_DAYS = 366
+
+
+def summarize_durations(seconds):
+    """
+    Count, mean and percentiles of a list of durations, in hours.
+    """
+    hours = sorted(value / 3600 for value in seconds if value is not None)
+    if not hours:
+        return {"count": 0, "average": None, "p50": None, "p85": None, "p95": None}
+
+    if len(hours) > 1:
+        percentiles = statistics.quantiles(hours, n=100, method="inclusive")
+    else:
+        percentiles = hours * 99
+    return {
+        "count": len(hours),
+        "average": statistics.fmean(hours),
+        "p50": percentiles[49],
+        "p85": percentiles[84],
+        "p95": percentiles[94],
+    }
+
+
+class AnalyticsViewSet(BoardMixin, ViewSet):
+    """
+    Board analytics, read from materialized views that are refreshed by a
+    Celery beat job, so no request aggregates raw task rows.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_permissions(self):
+        match self.action:
+            case "cumulative_flow" | "cycle_time" | "lead_time" | "throughput":
+                return [IsAuthenticated(), BoardGenericPermission()]
+            case _:
+                return super().get_permissions()
+
+    def get_date_range(self, request):
+        serializer = AnalyticsRangeSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            raise InvalidInputException
+
+        data = serializer.validated_data
+        end_date = data.get("end_date") or timezone.now().date()
+        start_date = data.get("start_date") or end_date - timedelta(
+            days=ANALYTICS_DEFAULT_DAYS
+        )
+        if start_date > end_date or (end_date - start_date).days > ANALYTICS_MAX_DAYS:
+            raise InvalidInputException
+        return start_date, end_date
+
+    def get_completed_flow_times(self, request):
+        start_date, end_date = self.get_date_range(request)
+        return TaskFlowTime.objects.filter(
+            board=request.board,
+            completed_at__date__gte=start_date,
+            completed_at__date__lte=end_date,
+        )
+
+    @action(methods=["GET"], detail=False, url_path="cumulative-flow")
+    def cumulative_flow(self, request, *args, **kwargs):
+        start_date, end_date = self.get_date_range(request)
+        rows = BoardCumulativeFlow.objects.filter(
+            board=request.board, day__gte=start_date, day__lte=end_date
+        ).values_list("day", "category", "task_count")
+
+        counts = {(day, category): task_count for day, category, task_count in rows}
+        labels = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+        series = {
+            category: [counts.get((day, category), 0) for day in labels]
+            for category in State.Category.values
+        }
+
+        response_data = {
+            "cumulative_flow": {"labels": labels, "series": series},
+        }
+        return Response(data=response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False, url_path="cycle-time")
+    def cycle_time(self, request, *args, **kwargs):
+        seconds = self.get_completed_flow_times(request).values_list(
+            "cycle_seconds", flat=True
+        )
+        response_data = {"cycle_time": summarize_durations(seconds)}
+        return Response(data=response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False, url_path="lead-time")
+    def lead_time(self, request, *args, **kwargs):
+        seconds = self.get_completed_flow_times(request).values_list(
+            "lead_seconds", flat=True
+        )
+        response_data = {"lead_time": summarize_durations(seconds)}
+        return Response(data=response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False)
+    def throughput(self, request, *args, **kwargs):
+        weeks = (
+            self.get_completed_flow_times(request)
+            .annotate(week=TruncWeek("completed_at"))
+            .values("week")
+            .annotate(completed_count=Count("task_id"))
+            .order_by("week")
+        )
+        response_data = {
+            "throughput": [
+                {"week": row["week"].date(), "completed_count": row["completed_count"]}
+                for row in weeks
+            ],
+        }
+        return Response(data=response_data, status=status.HTTP_200_OK)
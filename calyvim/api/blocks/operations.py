@@ -0,0 +1,171 @@
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from calyvim.exceptions import InvalidInputException
+from calyvim.models import Block
+
+
+class BlockOperations:
+    """
+    Applies a batch of block operations to a document in a fixed number of
+    queries.
+
+    Every referenced block is loaded with one query, the operations run in
+    memory against the document order, then new blocks are written with one
+    `bulk_create`, changed blocks with one `bulk_update` and the document
+    order with a single save, however many operations the batch holds.
+    """
+
+    UPDATE_FIELDS = ["block_type", "properties", "is_archived", "archived_at"]
+
+    def __init__(self, document, author):
+        self.document = document
+        self.author = author
+        self.content = list(document.content)
+        self.blocks = {}
+        self.existing_ids = set()
+        self.created = {}
+        self.changed = set()
+        self.now = timezone.now()
+
+    def load(self, block_ids):
+        # Ids are global, an insert may not reuse one from another document
+        blocks = Block.all_objects.filter(id__in=block_ids)
+        self.existing_ids = {block.id for block in blocks}
+        self.blocks = {
+            block.id: block for block in blocks if block.document_id == self.document.id
+        }
+
+    def get_block(self, block_id):
+        block = self.created.get(block_id) or self.blocks.get(block_id)
+        if block is None or block.is_archived:
+            raise InvalidInputException
+        return block
+
+    def place(self, block_id, after):
+        # `after` None puts the block first
+        if after is None:
+            self.content.insert(0, block_id)
+            return
+        try:
+            self.content.insert(self.content.index(after) + 1, block_id)
+        except ValueError:
+            raise InvalidInputException
+
+    def unplace(self, block_id):
+        try:
+            self.content.remove(block_id)
+        except ValueError:
+            pass
+
+    def insert(self, id, after=None, **fields):
+        if id in self.existing_ids or id in self.created:
+            raise InvalidInputException
+        if fields.get("page_id"):
+            self.get_block(fields["page_id"])
+        fields.setdefault("properties", {})
+        self.created[id] = Block(
+            id=id, document=self.document, created_by=self.author, **fields
+        )
+        self.place(id, after)
+
+    def move(self, id, after=None):
+        self.get_block(id)
+        self.unplace(id)
+        self.place(id, after)
+
+    def update(self, id, properties=None, block_type=None):
+        block = self.get_block(id)
+        if properties is not None:
+            block.properties = {**(block.properties or {}), **properties}
+        if block_type is not None:
+            block.block_type = block_type
+        if id not in self.created:
+            self.changed.add(id)
+
+    def delete(self, id):
+        block = self.get_block(id)
+        self.unplace(id)
+        if id in self.created:
+            del self.created[id]
+            return
+        block.is_archived = True
+        block.archived_at = self.now
+        self.changed.add(id)
+
+    @transaction.atomic
+    def apply(self, operations):
+        referenced = set()
+        for operation in operations:
+            # Inserted ids too, so reused ones are rejected instead of failing
+            # the bulk insert
+            referenced.add(operation["id"])
+            referenced.update(
+                operation[key] for key in ("after", "page_id") if operation.get(key)
+            )
+        self.load(referenced)
+
+        for operation in operations:
+            operation = dict(operation)
+            getattr(self, operation.pop("op"))(**operation)
+
+        Block.objects.bulk_create(self.created.values())
+        Block.all_objects.bulk_update(
+            [self.blocks[block_id] for block_id in self.changed], self.UPDATE_FIELDS
+        )
+        self.document.content = self.content
+        self.document.save(update_fields=["content"])
+        return self.content
+
+
+# Block fields the editor may set through `apply_block_updates`
+BLOCK_UPDATE_FIELDS = {"block_type", "properties", "content", "page_id"}
+
+
+@transaction.atomic
+def apply_block_updates(document, author, updates, content):
+    """
+    Whole-content variant used by the editor: sets the given fields on each
+    block in `updates`, creating the missing ones, replaces the document
+    order with `content` and archives the blocks it no longer lists. One
+    query per step regardless of the number of blocks.
+    """
+    try:
+        updates = {uuid.UUID(str(key)): values for key, values in updates.items()}
+    except ValueError:
+        raise InvalidInputException
+    if any(set(values) - BLOCK_UPDATE_FIELDS for values in updates.values()):
+        raise InvalidInputException
+    existing = Block.all_objects.in_bulk(updates.keys())
+    # Ids are global, blocks of other documents can not be updated or recreated
+    if any(block.document_id != document.id for block in existing.values()):
+        raise InvalidInputException
+
+    created, changed, fields = [], [], set()
+    for block_id, values in updates.items():
+        block = existing.get(block_id)
+        if block is None:
+            block = Block(
+                id=block_id, document=document, properties={}, created_by=author
+            )
+            created.append(block)
+        else:
+            changed.append(block)
+            fields.update(values.keys())
+        for key, value in values.items():
+            setattr(block, key, value)
+
+    Block.objects.bulk_create(created)
+    if changed:
+        Block.all_objects.bulk_update(changed, fields)
+
+    removed = set(document.content) - set(content)
+    document.content = content
+    document.save(update_fields=["content"])
+
+    if removed:
+        Block.objects.filter(id__in=removed, document=document).update(
+            is_archived=True, archived_at=timezone.now()
+        )
@@ -17,5 +17,34 @@ class BlockSerializer(serializers.ModelSerializer):
 
 
 class OperationsSerializer(serializers.Serializer):
-    updates = serializers.JSONField()
-    content = serializers.ListField(child=serializers.UUIDField())
\ No newline at end of file
+    updates = serializers.DictField(child=serializers.DictField())
+    content = serializers.ListField(child=serializers.UUIDField())
+
+
+class BlockOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["insert", "move", "update", "delete"])
+    id = serializers.UUIDField()
+    after = serializers.UUIDField(required=False, allow_null=True)
+    page_id = serializers.UUIDField(required=False, allow_null=True)
+    block_type = serializers.ChoiceField(
+        choices=Block.BlockType.choices, required=False
+    )
+    properties = serializers.DictField(required=False)
+
+    # Keys each operation accepts besides `op` and `id`
+    OP_FIELDS = {
+        "insert": {"after", "page_id", "block_type", "properties"},
+        "move": {"after"},
+        "update": {"block_type", "properties"},
+        "delete": set(),
+    }
+
+    def validate(self, attrs):
+        allowed = self.OP_FIELDS[attrs["op"]] | {"op", "id"}
+        return {key: value for key, value in attrs.items() if key in allowed}
+
+
+class BlockOperationLogSerializer(serializers.Serializer):
+    operations = serializers.ListField(
+        child=BlockOperationSerializer(), allow_empty=False, max_length=1000
+    )
\ No newline at end of file
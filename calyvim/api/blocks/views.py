@@ -3,12 +3,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import status
-from django.db import transaction
-from django.utils import timezone
 
-from calyvim.models import Block, Document
+from calyvim.models import Block
 from calyvim.mixins import DocumentMixin
-from calyvim.api.blocks.serializers import BlockSerializer, OperationsSerializer
+from calyvim.exceptions import InvalidInputException
+from calyvim.api.blocks.serializers import (
+    BlockSerializer,
+    OperationsSerializer,
+    BlockOperationLogSerializer,
+)
+from calyvim.api.blocks.operations import BlockOperations, apply_block_updates
 
 
 class BlocksViewst(DocumentMixin, ViewSet):
@@ -23,7 +27,8 @@ class BlocksViewst(DocumentMixin, ViewSet):
         blocks = Block.objects.filter(document=request.document, page_id=page_id)
 
         # Sort the blocks based on the order in the content list
-        sorted_blocks = sorted(blocks, key=lambda block: content_order.index(block.id))
+        positions = {block_id: index for index, block_id in enumerate(content_order)}
+        sorted_blocks = sorted(blocks, key=lambda block: positions[block.id])
 
         serializer = BlockSerializer(sorted_blocks, many=True)
 
@@ -34,7 +39,6 @@ class BlocksViewst(DocumentMixin, ViewSet):
         return Response(data=response_data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["POST"])
-    @transaction.atomic
     def operations(self, request, *args, **kwargs):
         serializer = OperationsSerializer(data=request.data)
 
@@ -48,33 +52,31 @@ class BlocksViewst(DocumentMixin, ViewSet):
             )
 
         data = serializer.validated_data
-        original_content = request.document.content
-        blocks_to_remove = set(original_content) - set(data["content"])
+        apply_block_updates(
+            request.document, request.user, data["updates"], data["content"]
+        )
 
-        for block_id, values in data["updates"].items():
-            block = Block.objects.filter(id=block_id, document=request.document).first()
-
-            if not block:
-                block = Block.objects.create(
-                    id=block_id,
-                    document=request.document,
-                    properties={},
-                    created_by=request.user,
-                )
-            for key, value in values.items():
-                setattr(block, key, value)
-            block.save(update_fields=values.keys())
-
-            request.document.content = data["content"]
-            request.document.save(update_fields=["content"])
+        response_data = {
+            "detail": "Blocks updated successfully",
+        }
+        return Response(data=response_data, status=status.HTTP_200_OK)
 
-        if len(blocks_to_remove) > 0:
-            block_ids = list(blocks_to_remove)
-            Block.objects.filter(id__in=block_ids, document=request.document).update(
-                is_archived=True, archived_at=timezone.now()
-            )
+    @action(detail=False, methods=["POST"], url_path="apply")
+    def apply(self, request, *args, **kwargs):
+        """
+        Operation log API: applies `insert` (after a block), `move`,
+        `update` (merges properties) and `delete` operations in order, all
+        or nothing.
+        """
+        serializer = BlockOperationLogSerializer(data=request.data)
+        if not serializer.is_valid():
+            raise InvalidInputException
 
+        content = BlockOperations(request.document, request.user).apply(
+            serializer.validated_data["operations"]
+        )
         response_data = {
+            "content": content,
             "detail": "Blocks updated successfully",
         }
         return Response(data=response_data, status=status.HTTP_200_OK)
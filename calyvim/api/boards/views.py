@@ -6,18 +6,24 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django.db.models import Count
 from django.db.models.functions import TruncDate
 
-from calyvim.utils import update_file_field, get_object_or_raise_api_404
+from calyvim.utils import (
+    update_file_field,
+    get_object_or_raise_api_404,
+    bump_board_version_on_commit,
+    publish_board_event_on_commit,
+    BoardSnapshot,
+    get_or_build,
+)
 from calyvim.models import (
     Board,
     Workspace,
-    BoardPermission,
     WorkspaceMembership,
     User,
     Task,
-    BoardPermission,
     BoardPermissionRole,
 )
 from calyvim.api.boards.serializers import (
@@ -34,6 +40,8 @@ from calyvim.api.boards.serializers import (
     SprintSerializer,
     EstimateSerializer,
 )
+from calyvim.permissions import resolve_board_access
+from calyvim.api.tasks.events import BOARD_RELOAD
 from calyvim.exceptions import (
     InvalidInputException,
     WorkspaceNotFoundException,
@@ -42,6 +50,8 @@ from calyvim.exceptions import (
     BoardInvalidPermission,
 )
 
+BOARD_METADATA_TIMEOUT = 60 * 10
+
 
 class BoardViewSet(ViewSet):
     permission_classes = [IsAuthenticated]
@@ -52,27 +62,27 @@ class BoardViewSet(ViewSet):
         )
         return workspace_membership
 
-    def check_for_board_permission(
-        self, user, board, allowed_roles=BoardPermissionRole.values
+    def get_board_with_permission(
+        self, request, board_id, allowed_roles=BoardPermissionRole.values
     ):
+        access = resolve_board_access(request, board_id)
+        if not access:
+            raise NotFound(detail="Board not found.")
+
         # Check if user has membership in the workspace related to the board
-        workspace_membership = self.get_workspace_membership(user, board.workspace)
-        if not workspace_membership:
+        if not access.is_workspace_member:
             raise WorkspaceInvalidPermission
 
         # Allow access if the user is an admin or maintainer in the workspace
-        if workspace_membership.role in {
-            WorkspaceMembership.Role.ADMIN,
-            WorkspaceMembership.Role.MAINTAINER,
-        }:
-            return
+        if access.has_workspace_role(
+            {WorkspaceMembership.Role.ADMIN, WorkspaceMembership.Role.MAINTAINER}
+        ):
+            return access.board
 
         # Check if user has specific board permission if not an admin or maintainer
-        has_permission = BoardPermission.objects.filter(
-            user=user, board=board, role__in=allowed_roles
-        ).exists()
-        if not has_permission:
+        if not access.has_board_role(allowed_roles):
             raise BoardInvalidPermission
+        return access.board
 
     def check_for_workspace_roles(
         self, user, workspace, allowed_roles=WorkspaceMembership.Role.values
@@ -135,22 +145,16 @@ class BoardViewSet(ViewSet):
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     def retrieve(self, request, *args, **kwargs):
-        board = get_object_or_raise_api_404(
-            Board, id=kwargs.get("pk"), message="Board not found."
-        )
-
-        self.check_for_board_permission(request.user, board)
+        board = self.get_board_with_permission(request, kwargs.get("pk"))
 
         serializer = BoardDetailSerializer(board)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def partial_update(self, request, *args, **kwargs):
-        board = get_object_or_raise_api_404(
-            Board, id=kwargs.get("pk"), message="Board not found."
+        board = self.get_board_with_permission(
+            request, kwargs.get("pk"), ["admin", "maintainer"]
         )
 
-        self.check_for_board_permission(request.user, board, ["admin", "maintainer"])
-
         update_serializer = BoardUpdateSerializer(data=request.data)
         if not update_serializer.is_valid():
             raise InvalidInputException
@@ -174,19 +178,19 @@ class BoardViewSet(ViewSet):
         board.save(update_fields=data.keys())
 
         if update_tasks_prefix:
-            Task.objects.filter(board=board).update(
-                name=Concat(Value(board.task_prefix), Value("-"), F("number"))
-            )
+            tasks = Task.objects.filter(board=board)
+            tasks.update(name=Concat(Value(board.task_prefix), Value("-"), F("number")))
+            tasks.refresh_search_vector()
+            bump_board_version_on_commit(board.id)
+            # Every task name changed, subscribers refetch instead
+            publish_board_event_on_commit(board.id, BOARD_RELOAD)
 
         serializer = BoardDetailSerializer(board)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @action(methods=["GET"], detail=True)
     def members(self, request, *args, **kwargs):
-        board = get_object_or_raise_api_404(
-            Board, id=kwargs.get("pk"), message="Board not found."
-        )
-        self.check_for_board_permission(request.user, board)
+        board = self.get_board_with_permission(request, kwargs.get("pk"))
         members = (
             User.objects.filter(user_board_permissions__board=board)
             .distinct()
@@ -197,13 +201,7 @@ class BoardViewSet(ViewSet):
         response_data = {"results": serializer.data}
         return Response(response_data, status=status.HTTP_200_OK)
 
-    @action(methods=["GET"], detail=True, url_path="metadata")
-    def metadata(self, request, *args, **kwargs):
-        board = get_object_or_raise_api_404(
-            Board, id=kwargs.get("pk"), message="Board not found."
-        )
-        self.check_for_board_permission(request.user, board)
-
+    def build_metadata(self, board):
         states = StateSerializer(board.states.all(), many=True)
         priorities = PrioritySerializer(board.priorities.all(), many=True)
         labels = LabelSerializer(board.labels.all(), many=True)
@@ -213,19 +211,35 @@ class BoardViewSet(ViewSet):
         )
         estimate = EstimateSerializer(board.estimates.all(), many=True)
 
+        return {
+            "states": states.data,
+            "priorities": priorities.data,
+            "labels": labels.data,
+            "members": members.data,
+            "sprints": sprints.data,
+            "estimates": estimate.data,
+        }
+
+    @action(methods=["GET"], detail=True, url_path="metadata")
+    def metadata(self, request, *args, **kwargs):
+        board = self.get_board_with_permission(request, kwargs.get("pk"))
+
+        snapshot = BoardSnapshot(request, board.id)
+        if snapshot.is_not_modified():
+            return snapshot.not_modified_response()
+
+        # Keyed by the board version, a bump moves readers to a new key so a
+        # rebuild racing a write can only refill the old one
         response_data = {
-            "metadata": {
-                "states": states.data,
-                "priorities": priorities.data,
-                "labels": labels.data,
-                "members": members.data,
-                "sprints": sprints.data,
-                "estimates": estimate.data,
-            },
+            "metadata": get_or_build(
+                f"{board.metadata_cache_key}:{snapshot.version}",
+                lambda: self.build_metadata(board),
+                timeout=BOARD_METADATA_TIMEOUT,
+            ),
             "detail": "Metadata for the board",
         }
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return snapshot.response(response_data)
 
     @action(methods=["GET"], detail=False, url_path="templates")
     def template(self, request, *args, **kwargs):
@@ -0,0 +1,69 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from calyvim.models import BoardPermissionRole
+from calyvim.permissions import resolve_board_access
+from calyvim.utils import get_broker, board_channel
+from calyvim.exceptions import BoardNotFoundException
+
+
+# Comment lines sent on idle streams so proxies do not close them
+HEARTBEAT_INTERVAL = 15
+
+# Client reconnect delay in milliseconds
+RECONNECT_DELAY = 3000
+
+
+async def stream_board_events(board_id):
+    yield f"retry: {RECONNECT_DELAY}\n\n"
+
+    channel = board_channel(board_id)
+    async for message in get_broker().subscribe(channel, HEARTBEAT_INTERVAL):
+        if message is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"data: {message}\n\n"
+
+
+@require_GET
+async def board_events(request, board_id):
+    """
+    Server-sent events stream of the task changes of a board, see
+    `calyvim.api.tasks.events` for the event types. Clients load the board
+    once and patch their local state from the events.
+
+    Async so an open stream only holds a coroutine under ASGI, not a worker.
+    Served by the `events` process in the Procfile, the rest of the API stays
+    on WSGI where the streamed exports are not buffered, so the proxy routes
+    only `/api/boards/<id>/events` to it.
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker reads the whole stream before responding, and the
+        # stream never ends
+        return JsonResponse(
+            {"detail": "Board events are only served over ASGI."}, status=404
+        )
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+
+    # Same check as BoardGenericPermission on the board API
+    access = await sync_to_async(resolve_board_access)(request, board_id)
+    if access is None or not access.has_board_role(BoardPermissionRole.values):
+        return JsonResponse(
+            {"detail": BoardNotFoundException.default_detail},
+            status=BoardNotFoundException.status_code,
+        )
+
+    response = StreamingHttpResponse(
+        stream_board_events(board_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx style proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,5 +1,5 @@
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import F
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.viewsets import ViewSet
@@ -7,12 +7,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from calyvim.models import Sprint, Task, TaskSnapshot
+from calyvim.models import Sprint, SprintDailyStat
 from calyvim.mixins import BoardMixin
 from calyvim.api.sprints.serializers import SprintSerializer, SprintCreateSerializer
 from calyvim.permissions import BoardGenericPermission
 from calyvim.exceptions import InvalidInputException
-from calyvim.utils import get_object_or_raise_api_404
+from calyvim.utils import get_object_or_raise_api_404, get_page_size
+from calyvim.tasks import (
+    get_sprint_daily_stats,
+    schedule_sprint_stats_rebuild,
+    sprint_days,
+)
+
+
+# Number of finished sprints shown on the velocity chart by default
+VELOCITY_SPRINTS = 6
 
 
 class SprintsViewSet(BoardMixin, ViewSet):
@@ -42,7 +51,7 @@ class SprintsViewSet(BoardMixin, ViewSet):
                     IsAuthenticated(),
                     BoardGenericPermission(allowed_roles=["admin", "maintainer"]),
                 ]
-            case "burndown":
+            case "burndown" | "burnup" | "velocity":
                 return [
                     IsAuthenticated(),
                     BoardGenericPermission(
@@ -137,52 +146,94 @@ class SprintsViewSet(BoardMixin, ViewSet):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
-    def daterange(self, start_date, end_date):
-        for n in range(int((end_date - start_date).days) + 1):
-            yield start_date + timezone.timedelta(n)
+    def sprint_series(self, sprint):
+        """
+        One rollup row per sprint day, from the start to the end date. Days
+        without a row yet (upcoming or still being rebuilt) count as zero.
+        """
+        stats = {stat.date: stat for stat in get_sprint_daily_stats(sprint)}
+        return [
+            stats.get(day) or SprintDailyStat(sprint=sprint, date=day)
+            for day in sprint_days(sprint, sprint.end_date)
+        ]
 
     @action(methods=["GET"], detail=True)
     def burndown(self, request, *args, **kwargs):
         sprint = get_object_or_raise_api_404(
             Sprint, board=request.board, pk=kwargs["pk"]
         )
-
-        task_burndown_data = (
-            TaskSnapshot.objects.filter(
-                date__gte=sprint.start_date,
-                date__lte=sprint.end_date,
-            )
-            .values("date")
-            .annotate(
-                total_count=Count("task_id", distinct=True),
-                pending_count = Count(
-                    "task_id",
-                    distinct=True,
-                    filter=Q(task__state__category="open") | Q(task__state__category="active")
-                )
-            )
-        )
+        stats = self.sprint_series(sprint)
 
         burndown_data = {
-            "labels": [],
-            "pending_tasks": [],
-            "total_tasks": []
+            "labels": [stat.date for stat in stats],
+            "pending_tasks": [stat.open_count + stat.active_count for stat in stats],
+            "total_tasks": [stat.total_count for stat in stats],
         }
-
-        task_burndown_dict = {data["date"]: data for data in task_burndown_data}
-
-        for single_date in self.daterange(sprint.start_date, sprint.end_date):
-            burndown_data["labels"].append(single_date)
-            burndown_data["pending_tasks"].append(
-                task_burndown_dict.get(single_date, {}).get("pending_count", 0)
-            )
-            burndown_data["total_tasks"].append(
-                task_burndown_dict.get(single_date, {}).get("total_count", 0)
-            )
-
         response_data = {
             "burndown": burndown_data,
             "detail": f"The burndown chart for the sprint '{sprint.name}' has been generated successfully.",
         }
 
         return Response(data=response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=True)
+    def burnup(self, request, *args, **kwargs):
+        sprint = get_object_or_raise_api_404(
+            Sprint, board=request.board, pk=kwargs["pk"]
+        )
+        stats = self.sprint_series(sprint)
+
+        burnup_data = {
+            "labels": [stat.date for stat in stats],
+            "completed_tasks": [stat.completed_count for stat in stats],
+            "total_tasks": [stat.total_count for stat in stats],
+            "completed_estimate": [stat.completed_estimate for stat in stats],
+            "total_estimate": [stat.total_estimate for stat in stats],
+        }
+        response_data = {
+            "burnup": burnup_data,
+            "detail": f"The burnup chart for the sprint '{sprint.name}' has been generated successfully.",
+        }
+
+        return Response(data=response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False)
+    def velocity(self, request, *args, **kwargs):
+        sprints = list(
+            Sprint.objects.filter(
+                board=request.board, end_date__lt=timezone.now().date()
+            ).order_by("-end_date")[: get_page_size(request, VELOCITY_SPRINTS)]
+        )
+
+        # The rollup row of the last sprint day holds its final counts
+        final_stats = {
+            stat.sprint_id: stat
+            for stat in SprintDailyStat.objects.filter(
+                sprint__in=sprints, date=F("sprint__end_date")
+            )
+        }
+
+        # Ran before the rollup existed or their last day was never rolled
+        # up, rebuilt in the background and reported empty meanwhile
+        missing = [sprint.id for sprint in sprints if sprint.id not in final_stats]
+        if missing:
+            schedule_sprint_stats_rebuild(request.board.id, missing)
+
+        velocity_data = []
+        for sprint in reversed(sprints):
+            stat = final_stats.get(sprint.id)
+            velocity_data.append(
+                {
+                    "sprint_id": sprint.id,
+                    "name": sprint.name,
+                    "start_date": sprint.start_date,
+                    "end_date": sprint.end_date,
+                    "completed_tasks": stat.completed_count if stat else 0,
+                    "total_tasks": stat.total_count if stat else 0,
+                    "completed_estimate": stat.completed_estimate if stat else 0,
+                    "total_estimate": stat.total_estimate if stat else 0,
+                }
+            )
+
+        response_data = {"velocity": velocity_data}
+        return Response(data=response_data, status=status.HTTP_200_OK)
@@ -14,7 +14,14 @@ from calyvim.api.states.serializers import (
     StateCreateSerializer,
 )
 from calyvim.exceptions import InvalidInputException
-from calyvim.utils import get_object_or_raise_api_404
+from calyvim.utils import (
+    get_object_or_raise_api_404,
+    sequence_between,
+    has_sequence_collision,
+    needs_rebalance,
+    rebalance_sequences,
+)
+from calyvim.tasks import schedule_state_rebalance
 
 
 class StatesViewSet(BoardMixin, ViewSet):
@@ -108,26 +115,27 @@ class StatesViewSet(BoardMixin, ViewSet):
         )
 
         data = serializer.validated_data
-        if data.get("previous_state") and data.get("next_state"):
-            previous_state = get_object_or_raise_api_404(
-                State, board=request.board, id=data.get("previous_state")
-            )
-            next_state = get_object_or_raise_api_404(
-                State, board=request.board, id=data.get("next_state")
-            )
-            state.sequence = (previous_state.sequence + next_state.sequence) / 2
-
-        elif data.get("previous_state"):
-            previous_state = get_object_or_raise_api_404(
-                State, board=request.board, id=data.get("previous_state")
-            )
-            state.sequence = previous_state.sequence + 10000
-
-        elif data.get("next_state"):
-            next_state = get_object_or_raise_api_404(
-                State, board=request.board, id=data.get("next_state")
-            )
-            state.sequence = next_state.sequence / 2
+        states = State.objects.filter(board=request.board)
+
+        def get_neighbour_sequence(key):
+            if not data.get(key):
+                return None
+            return get_object_or_raise_api_404(states, id=data.get(key)).sequence
+
+        # Without neighbours the state keeps its sequence
+        if data.get("previous_state") or data.get("next_state"):
+            previous_sequence = get_neighbour_sequence("previous_state")
+            next_sequence = get_neighbour_sequence("next_state")
+            state.sequence = sequence_between(previous_sequence, next_sequence)
+
+            if has_sequence_collision(state.sequence, previous_sequence, next_sequence):
+                # Out of precision between the neighbours, renumber the states
+                rebalance_sequences(states)
+                previous_sequence = get_neighbour_sequence("previous_state")
+                next_sequence = get_neighbour_sequence("next_state")
+                state.sequence = sequence_between(previous_sequence, next_sequence)
+            elif needs_rebalance(state.sequence, previous_sequence, next_sequence):
+                schedule_state_rebalance(request.board.id)
 
         state.save(update_fields=["sequence"])
         return Response(
@@ -12,7 +12,7 @@ from calyvim.api.task_comments.serializers import (
     TaskCommentSerializer,
     TaskCommentCreateSerializer,
 )
-from calyvim.utils import get_object_or_raise_api_404
+from calyvim.utils import get_object_or_raise_api_404, get_page_size, CursorPaginator
 
 
 class TaskCommentsViewSet(BoardMixin, ViewSet):
@@ -59,8 +59,20 @@ class TaskCommentsViewSet(BoardMixin, ViewSet):
         if comment_type != "all":
             comments = comments.filter(comment_type=comment_type)
 
+        page_size = get_page_size(request)
+        if page_size is None:
+            serializer = TaskCommentSerializer(comments, many=True)
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        comments, next_cursor = CursorPaginator(
+            ("-created_at", "-id"), page_size
+        ).paginate(comments, request.query_params.get("cursor"))
         serializer = TaskCommentSerializer(comments, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        response_data = {
+            "results": serializer.data,
+            "next_cursor": next_cursor,
+        }
+        return Response(data=response_data, status=status.HTTP_200_OK)
 
     @action(methods=["GET"], detail=False)
     def last(self, request, *args, **kwargs):
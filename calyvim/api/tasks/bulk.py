@@ -0,0 +1,166 @@
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from calyvim.exceptions import (
+    InvalidInputException,
+    StateNotFoundException,
+    PriorityNotFoundException,
+)
+from calyvim.utils import bump_board_version_on_commit, SEQUENCE_STEP
+from calyvim.tasks import schedule_sprint_stats_refresh
+from calyvim.api.tasks.events import publish_task_events, TASK_CREATED
+from calyvim.models import (
+    Task,
+    TaskAssignee,
+    TaskLabel,
+    TaskComment,
+    TaskSnapshot,
+    TaskStateHistory,
+    UserTaskIndex,
+)
+
+
+BULK_BATCH_SIZE = 1000
+
+
+class TaskBulkCreator:
+    """
+    Creates many tasks of a board with a fixed number of queries.
+
+    Task numbers are reserved as one block, sequences are computed per state
+    in memory from the current column tails, and the tasks with their
+    activity comments, snapshots, assignees and labels are written with one
+    `bulk_create` each. `Task.save` and the post_save signals are not run.
+    """
+
+    def __init__(self, board, author, batch_size=BULK_BATCH_SIZE):
+        self.board = board
+        self.author = author
+        self.batch_size = batch_size
+        self.tasks = []
+        self.task_assignees = []
+        self.task_labels = []
+
+    def add(self, assignee_ids=(), label_ids=(), **fields):
+        fields.setdefault("created_by", self.author)
+        task = Task(board=self.board, **fields)
+        if task.description and not task.description_raw:
+            task.description_raw = strip_tags(task.description)
+
+        self.tasks.append(task)
+        self.task_assignees.extend(
+            TaskAssignee(task=task, user_id=user_id)
+            for user_id in dict.fromkeys(assignee_ids)
+        )
+        self.task_labels.extend(
+            TaskLabel(task=task, label_id=label_id)
+            for label_id in dict.fromkeys(label_ids)
+        )
+        return task
+
+    def get_state_tails(self):
+        # One index probe per state in the batch, boards only have a few
+        state_ids = {task.state_id for task in self.tasks}
+        return {
+            state_id: Task.objects.tail_sequence(self.board.id, state_id)
+            for state_id in state_ids
+        }
+
+    def assign_numbers_and_sequences(self):
+        numbers = self.board.reserve_task_numbers(len(self.tasks))
+        tails = self.get_state_tails()
+        for task, number in zip(self.tasks, numbers):
+            task.number = number
+            task.name = f"{self.board.task_prefix}-{number}"
+
+            last_sequence = tails.get(task.state_id)
+            if last_sequence is not None:
+                task.sequence = last_sequence + SEQUENCE_STEP
+            tails[task.state_id] = task.sequence
+
+    @transaction.atomic
+    def save(self):
+        if not self.tasks:
+            return []
+
+        self.assign_numbers_and_sequences()
+        Task.objects.bulk_create(self.tasks, batch_size=self.batch_size)
+
+        today = timezone.now().date()
+        TaskComment.objects.bulk_create(
+            [
+                TaskComment(
+                    task=task,
+                    author=task.created_by,
+                    content="created the task.",
+                    comment_type=TaskComment.CommentType.ACTIVITY,
+                )
+                for task in self.tasks
+            ],
+            batch_size=self.batch_size,
+        )
+        TaskSnapshot.objects.bulk_create(
+            [
+                TaskSnapshot(task=task, state_id=task.state_id, date=today)
+                for task in self.tasks
+                if task.state_id
+            ],
+            batch_size=self.batch_size,
+        )
+        TaskStateHistory.objects.record(
+            (task.id, self.board.id, task.state_id)
+            for task in self.tasks
+            if task.state_id
+        )
+        TaskAssignee.objects.bulk_create(
+            self.task_assignees, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        TaskLabel.objects.bulk_create(
+            self.task_labels, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+        # bulk_create skips the post_save signals that version the board,
+        # refresh the sprint rollups, index the tasks per user and for search
+        # and notify the board subscribers
+        bump_board_version_on_commit(self.board.id)
+        schedule_sprint_stats_refresh(self.board.id)
+        publish_task_events(
+            self.board.id, TASK_CREATED, [task.id for task in self.tasks]
+        )
+        UserTaskIndex.objects.sync(task.id for task in self.tasks)
+        Task.objects.filter(
+            id__in=[task.id for task in self.tasks]
+        ).refresh_search_vector()
+        return self.tasks
+
+
+def check_bulk_references(board, items):
+    """
+    Makes sure every state, priority, estimate, sprint, parent, assignee and
+    label referenced by `items` belongs to `board`, with one query per kind.
+    """
+
+    def referenced(key):
+        return {item[key] for item in items if item.get(key)}
+
+    def referenced_many(key):
+        return {value for item in items for value in item.get(key, ())}
+
+    checks = (
+        (referenced("state_id"), board.states, StateNotFoundException),
+        (referenced("priority_id"), board.priorities, PriorityNotFoundException),
+        (referenced("estimate_id"), board.estimates, InvalidInputException),
+        (referenced("sprint_id"), board.sprints, InvalidInputException),
+        (referenced("parent_id"), board.board_tasks, InvalidInputException),
+        (referenced_many("label_ids"), board.labels, InvalidInputException),
+    )
+    for ids, queryset, exception in checks:
+        if ids and queryset.filter(id__in=ids).count() != len(ids):
+            raise exception
+
+    member_ids = referenced("assignee_id") | referenced_many("assignee_ids")
+    if member_ids and board.members.filter(id__in=member_ids).count() != len(
+        member_ids
+    ):
+        raise InvalidInputException
@@ -0,0 +1,247 @@
+from django.db.models import Case, When, Value, FloatField
+from django.utils import timezone
+from django.utils.html import strip_tags
+from rest_framework.exceptions import NotFound
+
+from calyvim.utils import bump_board_version_on_commit, SEQUENCE_STEP
+from calyvim.tasks import schedule_sprint_stats_refresh
+from calyvim.api.tasks.transitions import StateTransition
+from calyvim.api.tasks.events import publish_task_events, TASK_MOVED
+from calyvim.models import (
+    Task,
+    TaskComment,
+    State,
+    Priority,
+    Estimate,
+    Sprint,
+    UserTaskIndex,
+)
+
+
+class TaskChangeSet:
+    """
+    Applies a validated task update in a fixed number of queries.
+
+    Every referenced row is resolved with one query per model, the task is
+    written with a single UPDATE and the activity comments and the state
+    snapshot are inserted in bulk, no matter how many fields change.
+    """
+
+    # Task relations read while describing the changes
+    TASK_RELATIONS = ("state", "priority", "estimate", "sprint", "assignee")
+
+    RELATED_MODELS = {
+        "state_id": State,
+        "priority_id": Priority,
+        "estimate_id": Estimate,
+        "sprint_id": Sprint,
+    }
+
+    def __init__(self, task, board, author, data):
+        self.task = task
+        self.board = board
+        self.author = author
+        self.data = data
+        self.related = {}
+        self.task_updates = []
+        self.comments = []
+        self.new_state = None
+
+    def resolve(self):
+        for key, model in self.RELATED_MODELS.items():
+            value = self.data.get(key)
+            if value:
+                instance = model.objects.filter(board=self.board, id=value).first()
+                if instance is None:
+                    raise NotFound(detail="Resource not found")
+                self.related[key] = instance
+
+        assignee_id = self.data.get("assignee_id")
+        if assignee_id:
+            assignee = self.board.members.filter(id=assignee_id).first()
+            if assignee is None:
+                raise NotFound(detail="Resource not found")
+            self.related["assignee_id"] = assignee
+
+    def describe(self):
+        task = self.task
+        for key, value in self.data.items():
+            related = self.related.get(key)
+            match key:
+                case "estimate_id":
+                    if task.estimate:
+                        self.task_updates.append(
+                            f"changed estimate from {task.estimate.value} to {related.value}"
+                        )
+                    else:
+                        self.task_updates.append(f"has set estimate as {related.value}")
+
+                case "priority_id":
+                    if not value:
+                        if task.priority:
+                            self.task_updates.append(
+                                f"removed priority {task.priority.name}."
+                            )
+                    elif task.priority:
+                        self.task_updates.append(
+                            f"changed priority from {task.priority.name} to {related.name}."
+                        )
+                    else:
+                        self.task_updates.append(
+                            f"has set task priority as {related.name}"
+                        )
+
+                case "assignee_id":
+                    if not value:
+                        if task.assignee:
+                            self.task_updates.append(
+                                f"removed assignee {task.assignee.display_name}."
+                            )
+                    elif task.assignee:
+                        self.task_updates.append(
+                            f"changed assignee from {task.assignee.display_name} to {related.display_name}."
+                        )
+                    else:
+                        self.task_updates.append(f"assigned to {related.display_name}.")
+
+                case "task_type":
+                    self.task_updates.append(
+                        f"changed task type from {task.task_type} to {value}."
+                    )
+
+                case "state_id":
+                    previous_state = task.state.name if task.state else None
+                    self.task_updates.append(
+                        f"changed state from {previous_state} to {related.name}."
+                    )
+                    self.new_state = related
+
+                case "sprint_id":
+                    if value:
+                        if not task.sprint:
+                            self.task_updates.append(f"added to sprint {related.name}.")
+                        else:
+                            self.task_updates.append(f"moved to sprint {related.name}.")
+                    elif task.sprint:
+                        self.task_updates.append(
+                            f"removed from sprint {task.sprint.name}."
+                        )
+
+                case "description":
+                    self.comments.append(self.activity("updated the description."))
+                    self.task_updates.append("updated description.")
+
+                case "summary":
+                    self.task_updates.append("updated summary.")
+
+    def activity(self, content):
+        return TaskComment(
+            task=self.task,
+            content=content,
+            author=self.author,
+            comment_type=TaskComment.CommentType.ACTIVITY,
+        )
+
+    def apply(self):
+        """
+        Writes the change set and returns the activity log comment, if any.
+        """
+        self.resolve()
+        self.describe()
+
+        transition = None
+        if self.new_state is not None:
+            transition = StateTransition(self.new_state)
+            state_changed = self.task.state_id != self.new_state.id
+
+        update_fields = list(self.data.keys())
+        for key, value in self.data.items():
+            setattr(self.task, key, value)
+            if key in self.related:
+                # Keep the cached relation in sync with the new id
+                setattr(self.task, key.removesuffix("_id"), self.related[key])
+
+        if "description" in self.data:
+            self.task.description_raw = strip_tags(self.data["description"])
+            update_fields.append("description_raw")
+
+        if transition is not None:
+            self.task.completed_at = transition.completed_at_for(self.task)
+            update_fields.append("completed_at")
+
+        if update_fields:
+            # auto_now is only written when listed in update_fields
+            update_fields.append("updated_at")
+            self.task.save(update_fields=update_fields)
+
+        if transition is not None and state_changed:
+            transition.record([self.task])
+
+        log = None
+        if self.task_updates:
+            log = self.activity(", ".join(self.task_updates))
+            self.comments.append(log)
+
+        if self.comments:
+            TaskComment.objects.bulk_create(self.comments)
+        return log
+
+
+def move_tasks_to_state(tasks, state, author):
+    """
+    Appends `tasks` to the end of `state` in their current order.
+
+    The new sequences and `completed_at` are assigned with a single
+    UPDATE ... CASE statement, the activity comments and the state snapshots
+    are inserted in bulk, and the passed in task instances are updated in
+    memory so callers can serialize them without fetching them again.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return tasks
+
+    last_sequence = Task.objects.tail_sequence(state.board_id, state.id)
+    new_sequence = (
+        last_sequence + SEQUENCE_STEP if last_sequence is not None else SEQUENCE_STEP
+    )
+
+    transition = StateTransition(state)
+    sequences = []
+    comments = []
+    moved = []
+    now = timezone.now()
+    for task in tasks:
+        if transition.move(task):
+            moved.append(task)
+
+        task.sequence = new_sequence
+        task.updated_at = now
+        sequences.append(When(id=task.id, then=Value(new_sequence)))
+        new_sequence += SEQUENCE_STEP
+
+        comments.append(
+            TaskComment(
+                task=task,
+                content=f"state changed to {state.name}",
+                comment_type=TaskComment.CommentType.ACTIVITY,
+                author=author,
+            )
+        )
+
+    Task.objects.filter(id__in=[task.id for task in tasks]).update(
+        state_id=state.id,
+        sequence=Case(*sequences, output_field=FloatField()),
+        completed_at=transition.completed_at_expression(),
+        updated_at=now,
+    )
+    TaskComment.objects.bulk_create(comments)
+    transition.record(moved)
+
+    # update() skips the post_save signals that version the board, refresh
+    # the sprint rollups and the users' task index and notify the board
+    # subscribers
+    UserTaskIndex.objects.sync(task.id for task in tasks)
+    bump_board_version_on_commit(state.board_id)
+    schedule_sprint_stats_refresh(state.board_id)
+    publish_task_events(state.board_id, TASK_MOVED, [task.id for task in tasks])
+    return tasks
@@ -0,0 +1,49 @@
+from django.db import transaction
+
+from calyvim.models import Task
+from calyvim.utils import publish_board_event
+
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_MOVED = "task.moved"
+TASK_ARCHIVED = "task.archived"
+TASK_RESTORED = "task.restored"
+TASK_DELETED = "task.deleted"
+BOARD_RELOAD = "board.reload"
+
+
+def task_event_type(task, created, update_fields=None):
+    if created:
+        return TASK_CREATED
+
+    fields = set(update_fields or ())
+    if "is_archived" in fields:
+        return TASK_ARCHIVED if task.is_archived else TASK_RESTORED
+    if fields & {"state", "state_id", "sequence"}:
+        return TASK_MOVED
+    return TASK_UPDATED
+
+
+def publish_task_events(board_id, event_type, task_ids):
+    """
+    After the commit, pushes `event_type` with the compact rows of the tasks
+    to the board subscribers, read with one query so clients can patch their
+    local state without refetching the board.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+
+    def publish():
+        tasks = list(Task.all_objects.filter(id__in=task_ids).compact())
+        publish_board_event(board_id, event_type, tasks=tasks)
+
+    transaction.on_commit(publish)
+
+
+def publish_task_deleted(board_id, task_id):
+    def publish():
+        publish_board_event(board_id, TASK_DELETED, tasks=[{"id": task_id}])
+
+    transaction.on_commit(publish)
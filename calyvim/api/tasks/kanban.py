@@ -0,0 +1,163 @@
+from collections import defaultdict
+
+from calyvim.models import Task
+from calyvim.utils import CursorPaginator
+from calyvim.api.tasks.serializers import (
+    TaskSerializer,
+    StateSerializer,
+    MemberSerializer,
+    PrioritySerializer,
+    EstimateSerializer,
+)
+
+
+# Column ordering, also used for the per column cursors
+COLUMN_ORDERING = ("sequence", "id")
+
+# Maps a board group_by value to the task attribute used as the group key
+GROUP_FIELDS = {
+    "assignee": "assignee_id",
+    "priority": "priority_id",
+    "task_type": "task_type",
+    "estimate": "estimate_id",
+}
+
+
+class KanbanBuckets:
+    """
+    Partitions tasks into (group_key, state_id) buckets in a single pass.
+
+    Every task is serialized exactly once and the states are serialized once,
+    so building the board is linear in the number of tasks instead of
+    groups x states x tasks.
+    """
+
+    def __init__(self, states, group_field=None, page_size=None):
+        self.states = list(states)
+        self.states_data = StateSerializer(self.states, many=True).data
+        self.group_field = group_field
+        self.page_size = page_size
+        self.buckets = defaultdict(list)
+        self.counts = {}
+
+    def group_key_for(self, task):
+        if self.group_field is None:
+            return None
+        return getattr(task, self.group_field)
+
+    def add(self, group_key, state_id, task_data):
+        self.buckets[(group_key, state_id)].append(task_data)
+
+    def fill(self, tasks, serializer_class=TaskSerializer):
+        tasks = list(tasks)
+        tasks_data = serializer_class(tasks, many=True).data
+        for task, task_data in zip(tasks, tasks_data):
+            self.add(self.group_key_for(task), task.state_id, task_data)
+        return self
+
+    def set_counts(self, rows):
+        for row in rows:
+            group_key = row[self.group_field] if self.group_field else None
+            self.counts[(group_key, row["state_id"])] = row["count"]
+        return self
+
+    def fill_rows(self, rows):
+        # Compact rows are already plain dicts, they are bucketed as they are
+        for row in rows:
+            group_key = row[self.group_field] if self.group_field else None
+            self.add(group_key, row["state_id"], row)
+        return self
+
+    def column(self, key, state_data):
+        tasks = self.buckets.get(key, [])
+        if self.page_size is None:
+            return {**state_data, "tasks": tasks}
+
+        # Paged columns only hold the first page, the counts tell whether
+        # there is more to fetch from the column endpoint.
+        count = self.counts.get(key, 0)
+        next_cursor = None
+        if tasks and count > len(tasks):
+            next_cursor = CursorPaginator(COLUMN_ORDERING).encode_cursor(tasks[-1])
+        return {
+            **state_data,
+            "tasks": tasks,
+            "count": count,
+            "next_cursor": next_cursor,
+        }
+
+    def columns(self, group_key=None):
+        return [
+            self.column((group_key, state.id), state_data)
+            for state, state_data in zip(self.states, self.states_data)
+        ]
+
+
+def get_group_filter(group_by, group_key):
+    """
+    Filter kwargs selecting the tasks of a single group, `no_<group_by>`
+    selects the tasks without a value.
+    """
+    group_field = GROUP_FIELDS.get(group_by)
+    if group_field is None:
+        return {}
+    if group_key == f"no_{group_by}":
+        return {f"{group_field}__isnull": True}
+    return {group_field: group_key}
+
+
+def get_kanban_groups(board, group_by):
+    """
+    Returns (group_key, bucket_key, extra) tuples for every group of the board,
+    in display order. `bucket_key` is the value tasks carry for that group.
+    """
+    match group_by:
+        case "assignee":
+            groups = [
+                (member.id, member.id, {"assignee": MemberSerializer(member).data})
+                for member in board.members
+            ]
+            groups.append(("no_assignee", None, {"assignee": None}))
+        case "priority":
+            groups = [
+                (
+                    priority.id,
+                    priority.id,
+                    {"priority": PrioritySerializer(priority).data},
+                )
+                for priority in board.priorities.all()
+            ]
+            groups.append(("no_priority", None, {"priority": None}))
+        case "task_type":
+            groups = [
+                (task_type, task_type, {"task_type": label})
+                for task_type, label in Task.TaskType.choices
+            ]
+        case "estimate":
+            groups = [
+                (
+                    estimate.id,
+                    estimate.id,
+                    {"estimate": EstimateSerializer(estimate).data},
+                )
+                for estimate in board.estimates.all()
+            ]
+            groups.append(("no_estimate", None, {"estimate": None}))
+        case _:
+            groups = []
+    return groups
+
+
+def build_kanban_results(board, buckets, group_by=None):
+    if not group_by:
+        return buckets.columns()
+
+    return [
+        {
+            "group_key": group_key,
+            "states": buckets.columns(bucket_key),
+            "group_by": group_by,
+            **extra,
+        }
+        for group_key, bucket_key, extra in get_kanban_groups(board, group_by)
+    ]
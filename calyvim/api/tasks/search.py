@@ -0,0 +1,37 @@
+from django.db.models import F
+
+from calyvim.utils import build_prefix_search_query
+from calyvim.exceptions import InvalidInputException
+
+
+SEARCH_PAGE_SIZE = 20
+
+SEARCH_ONLY_FIELDS = (
+    "id",
+    "board_id",
+    "parent_id",
+    "state_id",
+    "priority_id",
+    "task_type",
+    "number",
+    "name",
+    "summary",
+    "completed_at",
+    "created_at",
+)
+
+
+def search_tasks(queryset, text, limit=SEARCH_PAGE_SIZE):
+    """
+    The `limit` best matches of `text` within `queryset`, by rank and then
+    recency. Only the result columns are read, the stored vector is not.
+    """
+    query = build_prefix_search_query(text)
+    if query is None:
+        raise InvalidInputException
+
+    return list(
+        queryset.search(query)
+        .only(*SEARCH_ONLY_FIELDS)
+        .order_by(F("rank").desc(), F("created_at").desc())[:limit]
+    )
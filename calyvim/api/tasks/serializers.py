@@ -105,6 +105,20 @@ class TaskCreateSerializer(serializers.Serializer):
     sprint_id = serializers.UUIDField(required=False, allow_null=True)
 
 
+class TaskBulkCreateItemSerializer(TaskCreateSerializer):
+    estimate_id = serializers.UUIDField(required=False, allow_null=True)
+    assignee_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=True
+    )
+    label_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=True
+    )
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    tasks = TaskBulkCreateItemSerializer(many=True, allow_empty=False, max_length=1000)
+
+
 class TaskSerializer(serializers.ModelSerializer):
     assignees = AssigneeSerializer(many=True)
     labels = LabelSerializer(many=True)
@@ -216,3 +230,24 @@ class BulkUpdateSerializer(serializers.Serializer):
     ids = serializers.ListField(child=serializers.UUIDField())
     property = serializers.CharField()
     value = serializers.UUIDField()
+
+
+class TaskSearchResultSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "board_id",
+            "parent_id",
+            "state_id",
+            "priority_id",
+            "task_type",
+            "number",
+            "name",
+            "summary",
+            "completed_at",
+            "created_at",
+            "rank",
+        ]
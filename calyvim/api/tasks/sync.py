@@ -0,0 +1,65 @@
+import time
+
+from calyvim.exceptions import InvalidInputException
+from calyvim.models import Task, TaskChange
+from calyvim.tasks import CHANGE_LOG_RETENTION_DAYS
+
+
+# Change log rows are pruned after this, older tokens get a reset
+CHANGE_LOG_RETENTION = CHANGE_LOG_RETENTION_DAYS * 24 * 60 * 60
+
+# Past this many changed tasks a full reload is cheaper for the client
+MAX_SYNC_CHANGES = 1000
+
+
+def encode_change_token(txid, issued_at=None):
+    return f"{txid}.{int(issued_at or time.time())}"
+
+
+def decode_change_token(token):
+    try:
+        txid, issued_at = map(int, token.split("."))
+    except ValueError:
+        raise InvalidInputException
+    return txid, issued_at
+
+
+def get_task_changes(board, token=None):
+    """
+    Tasks of `board` changed since `token`: the compact rows of the tasks
+    that are still on the board and the IDs of the deleted or archived ones,
+    plus the token to pass next time.
+
+    Without a token, or when the client has to reload the whole board, only
+    a fresh token and `reset` are returned. Clients take the token before
+    loading the board so no change falls between the two.
+    """
+    horizon = TaskChange.objects.horizon()
+    response = {"upserts": [], "deleted": [], "reset": True}
+    response["next"] = encode_change_token(horizon)
+    if not token:
+        return response
+
+    since, issued_at = decode_change_token(token)
+    if time.time() - issued_at > CHANGE_LOG_RETENTION:
+        return response
+
+    task_ids = set(
+        TaskChange.objects.between(board.id, since, horizon)
+        .order_by()
+        .values_list("task_id", flat=True)
+        .distinct()[: MAX_SYNC_CHANGES + 1]
+    )
+    if len(task_ids) > MAX_SYNC_CHANGES:
+        return response
+
+    upserts = []
+    if task_ids:
+        upserts = list(Task.objects.filter(board=board, id__in=task_ids).compact())
+    upserted_ids = {task["id"] for task in upserts}
+    response.update(
+        upserts=upserts,
+        deleted=[task_id for task_id in task_ids if task_id not in upserted_ids],
+        reset=False,
+    )
+    return response
@@ -0,0 +1,67 @@
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from calyvim.models import State, TaskSnapshot, TaskStateHistory
+
+
+class StateTransition:
+    """
+    Moves tasks into `state`. Every state change path goes through here so
+    `completed_at`, the daily snapshots and the state history stay in sync.
+
+    `completed_at` is set when a task enters a completed state, kept while it
+    moves between completed states and cleared when it leaves them. It is
+    written by the caller's own UPDATE, using `completed_at_for` for a single
+    save or `completed_at_expression` for a queryset update.
+    """
+
+    def __init__(self, state, at=None):
+        self.state = state
+        self.at = at or timezone.now()
+
+    @property
+    def completes(self):
+        return self.state.category == State.Category.COMPLETED
+
+    def completed_at_for(self, task):
+        if not self.completes:
+            return None
+        return task.completed_at or self.at
+
+    def completed_at_expression(self):
+        if not self.completes:
+            return None
+        return Coalesce(F("completed_at"), Value(self.at))
+
+    def move(self, task):
+        """
+        Applies the transition to a task in memory and returns whether its
+        state changed. The caller saves `state_id` and `completed_at`.
+        """
+        changed = task.state_id != self.state.id
+        task.completed_at = self.completed_at_for(task)
+        task.state = self.state
+        return changed
+
+    def record(self, tasks):
+        """
+        Writes the snapshot and state history of the tasks that changed state.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+
+        TaskSnapshot.objects.bulk_create(
+            [
+                TaskSnapshot(task=task, state=self.state, date=self.at.date())
+                for task in tasks
+            ],
+            update_conflicts=True,
+            unique_fields=["task", "date"],
+            update_fields=["state"],
+        )
+        TaskStateHistory.objects.record(
+            [(task.id, self.state.board_id, self.state.id) for task in tasks],
+            at=self.at,
+        )
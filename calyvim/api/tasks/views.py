@@ -1,15 +1,28 @@
 from django.db import transaction
 from django.db.models import Q
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from django.utils.html import strip_tags
 from rest_framework import status
 from rest_framework.viewsets import ViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from calyvim.utils import get_object_or_raise_api_404
+from calyvim.utils import (
+    get_object_or_raise_api_404,
+    get_page_size,
+    stream_json_results,
+    iterate_in_chunks,
+    CursorPaginator,
+    DEFAULT_PAGE_SIZE,
+    cache_board_snapshot,
+    bump_board_version_on_commit,
+    sequence_between,
+    has_sequence_collision,
+    needs_rebalance,
+    rebalance_sequences,
+)
 from calyvim.models import (
     Task,
     TaskAssignee,
@@ -18,27 +31,39 @@ from calyvim.models import (
     User,
     TaskComment,
     BoardPermissionRole,
-    Estimate,
     Sprint,
-    TaskSnapshot,
     Label,
+    TaskLabel,
+    UserTaskIndex,
 )
 from calyvim.mixins import BoardMixin
+from calyvim.tasks import schedule_task_rebalance, schedule_sprint_stats_refresh
 from calyvim.api.tasks.serializers import (
     TaskSerializer,
     TaskSequenceUpdateSerializer,
     TaskCreateSerializer,
     TaskUpdateSerializer,
     TaskCommentSerializer,
-    StateSerializer,
-    MemberSerializer,
-    PrioritySerializer,
     LabelSerializer,
     SprintSerializer,
     AttachmentSerializer,
     CommentSerializer,
-    EstimateSerializer,
     BulkUpdateSerializer,
+    TaskBulkCreateSerializer,
+    TaskSearchResultSerializer,
+)
+from calyvim.api.tasks.bulk import TaskBulkCreator, check_bulk_references
+from calyvim.api.tasks.search import search_tasks, SEARCH_PAGE_SIZE
+from calyvim.api.tasks.events import publish_task_events, TASK_UPDATED
+from calyvim.api.tasks.sync import get_task_changes
+from calyvim.api.tasks.changes import TaskChangeSet, move_tasks_to_state
+from calyvim.api.tasks.transitions import StateTransition
+from calyvim.api.tasks.kanban import (
+    KanbanBuckets,
+    GROUP_FIELDS,
+    COLUMN_ORDERING,
+    build_kanban_results,
+    get_group_filter,
 )
 from calyvim.permissions import BoardGenericPermission
 from calyvim.exceptions import (
@@ -48,15 +73,17 @@ from calyvim.exceptions import (
     PriorityNotFoundException,
 )
 
+STREAM_CHUNK_SIZE = 2000
+
 
 class TasksViewSet(BoardMixin, ViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
         match self.action:
-            case "list":
+            case "list" | "search" | "changes":
                 return [IsAuthenticated(), BoardGenericPermission()]
-            case "create":
+            case "create" | "bulk_create":
                 return [
                     IsAuthenticated(),
                     BoardGenericPermission(
@@ -69,6 +96,8 @@ class TasksViewSet(BoardMixin, ViewSet):
                 ]
             case "retrieve":
                 return [IsAuthenticated(), BoardGenericPermission()]
+            case "kanban_column":
+                return [IsAuthenticated(), BoardGenericPermission()]
             case "partial_update":
                 return [
                     IsAuthenticated(),
@@ -203,8 +232,37 @@ class TasksViewSet(BoardMixin, ViewSet):
         }
         return Response(data=response_data, status=status.HTTP_201_CREATED)
 
+    @transaction.atomic
+    @action(methods=["POST"], detail=False, url_path="bulk-create")
+    def bulk_create(self, request, *args, **kwargs):
+        create_serializer = TaskBulkCreateSerializer(data=request.data)
+        if not create_serializer.is_valid():
+            raise InvalidInputException
+
+        items = create_serializer.validated_data["tasks"]
+        check_bulk_references(request.board, items)
+
+        creator = TaskBulkCreator(request.board, request.user)
+        for item in items:
+            creator.add(**item)
+        tasks = creator.save()
+
+        serializer = TaskSerializer(
+            Task.objects.for_read().filter(id__in=[task.id for task in tasks]),
+            many=True,
+        )
+        response_data = {
+            "detail": f"{len(tasks)} tasks have been created successfully",
+            "tasks": serializer.data,
+        }
+        return Response(data=response_data, status=status.HTTP_201_CREATED)
+
     def retrieve(self, request, *args, **kwargs):
-        task = Task.objects.filter(board=request.board, id=kwargs.get("pk")).first()
+        task = (
+            Task.objects.for_read()
+            .filter(board=request.board, id=kwargs.get("pk"))
+            .first()
+        )
         if not task:
             raise TaskNotFoundException
 
@@ -222,7 +280,7 @@ class TasksViewSet(BoardMixin, ViewSet):
                             attachments, many=True
                         ).data
                     case "subtasks":
-                        subtasks = task.subtasks.all()
+                        subtasks = task.subtasks.for_read()
                         response_data["subtasks"] = TaskSerializer(
                             subtasks, many=True
                         ).data
@@ -236,33 +294,69 @@ class TasksViewSet(BoardMixin, ViewSet):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+    def stream_tasks(self, queryset, compact=False):
+        if compact:
+            rows = queryset.compact().iterator(chunk_size=STREAM_CHUNK_SIZE)
+            return iterate_in_chunks(rows, STREAM_CHUNK_SIZE)
+
+        tasks = queryset.for_read().iterator(chunk_size=STREAM_CHUNK_SIZE)
+        return (
+            TaskSerializer(chunk, many=True).data
+            for chunk in iterate_in_chunks(tasks, STREAM_CHUNK_SIZE)
+        )
+
+    @cache_board_snapshot
     def list(self, request, *args, **kwargs):
         parent_id = request.query_params.get("parent_id", None)
-        queryset = Task.objects.filter(
-            board=request.board, archived_at__isnull=True, parent_id=parent_id
-        )
-        tasks = (
-            queryset.prefetch_related("assignees", "labels")
-            .select_related("priority", "created_by", "estimate", "sprint", "assignee")
-            .order_by("sequence")
-        )
-        serializer = TaskSerializer(tasks, many=True)
+        # Task.objects already excludes archived tasks (is_archived=False)
+        queryset = Task.objects.filter(board=request.board, parent_id=parent_id)
+        if request.query_params.get("state_id"):
+            queryset = queryset.filter(state_id=request.query_params.get("state_id"))
+
+        compact = request.query_params.get("representation") == "compact"
+        if request.query_params.get("stream") == "true":
+            # Full exports, rows are fetched and written out chunk by chunk
+            return StreamingHttpResponse(
+                stream_json_results(
+                    self.stream_tasks(queryset.order_by(*COLUMN_ORDERING), compact)
+                ),
+                content_type="application/json",
+            )
+
+        if compact:
+            queryset = queryset.compact()
+        else:
+            queryset = queryset.for_read()
+
+        page_size = get_page_size(request)
+        next_cursor = None
+        if page_size is None:
+            tasks = queryset.order_by(*COLUMN_ORDERING)
+        else:
+            tasks, next_cursor = CursorPaginator(COLUMN_ORDERING, page_size).paginate(
+                queryset, request.query_params.get("cursor")
+            )
+
+        if compact:
+            results = list(tasks)
+        else:
+            results = TaskSerializer(tasks, many=True).data
+
         response_data = {
-            "results": serializer.data,
+            "results": results,
         }
+        if page_size is not None:
+            response_data["next_cursor"] = next_cursor
         return Response(data=response_data, status=status.HTTP_200_OK)
 
-    @action(methods=["GET"], detail=False)
-    def kanban(self, request, *args, **kwargs):
+    def get_kanban_queryset(self, request):
         parent_id = request.query_params.get("parent_id", None)
         sprint_id = request.query_params.get("sprint_id", None)
         queryset = Task.objects.filter(
             board=request.board,
-            archived_at__isnull=True,
             parent_id=parent_id,
             sprint_id=sprint_id,
         )
-        group_by = request.query_params.get("group_by", None)
         if request.query_params.getlist("assignees[]"):
             # Filter for assignees
             assignees = request.query_params.getlist("assignees[]")
@@ -279,195 +373,43 @@ class TasksViewSet(BoardMixin, ViewSet):
             queryset = queryset.filter(priority__in=priorities)
 
         if request.query_params.getlist("labels[]"):
-            # Filter for labels
+            # Filter for labels, through a subquery so tasks are not repeated
+            # once per matching label
             labels = request.query_params.getlist("labels[]")
-            queryset = queryset.filter(labels__in=labels)
+            queryset = queryset.filter(
+                id__in=TaskLabel.objects.filter(label__in=labels).values("task_id")
+            )
 
         if request.query_params.getlist("estimates[]"):
             # Filter for estimates
             estimates = request.query_params.getlist("estimates[]")
             queryset = queryset.filter(estimate__in=estimates)
 
-        tasks = queryset.select_related(
-            "priority", "created_by", "estimate", "sprint", "assignee"
-        ).order_by("sequence")
-        results = []
-
-        states = request.board.states.all()
-        if not group_by:
-            for state in states:
-                state_tasks = [task for task in tasks if task.state_id == state.id]
-                results.append(
-                    {
-                        **StateSerializer(state).data,
-                        "tasks": TaskSerializer(state_tasks, many=True).data,
-                    }
-                )
-
-        elif group_by == "assignee":
-            assignees = request.board.members
-            for assignee in assignees:
-                states_data = []
-                member_tasks = [
-                    task for task in tasks if task.assignee_id == assignee.id
-                ]
-                for state in states:
-                    state_tasks = [
-                        task for task in member_tasks if task.state_id == state.id
-                    ]
-                    states_data.append(
-                        {
-                            **StateSerializer(state).data,
-                            "tasks": TaskSerializer(state_tasks, many=True).data,
-                        }
-                    )
+        return queryset.order_by(*COLUMN_ORDERING)
 
-                results.append(
-                    {
-                        "group_key": assignee.id,
-                        "states": states_data,
-                        "group_by": group_by,
-                        "assignee": MemberSerializer(assignee).data,
-                    }
-                )
-            unassigned_tasks = [task for task in tasks if task.assignee_id is None]
-            states_data = []
-            for state in states:
-                state_tasks = [
-                    task for task in unassigned_tasks if task.state_id == state.id
-                ]
-                states_data.append(
-                    {
-                        **StateSerializer(state).data,
-                        "tasks": TaskSerializer(state_tasks, many=True).data,
-                    }
-                )
-            results.append(
-                {
-                    "group_key": "no_assignee",
-                    "states": states_data,
-                    "group_by": group_by,
-                    "assignee": None,
-                }
-            )
+    @action(methods=["GET"], detail=False)
+    @cache_board_snapshot
+    def kanban(self, request, *args, **kwargs):
+        queryset = self.get_kanban_queryset(request)
+        group_by = request.query_params.get("group_by", None)
+        group_field = GROUP_FIELDS.get(group_by)
+        page_size = get_page_size(request)
 
-        elif group_by == "priority":
-            priorities = request.board.priorities.all()
-            for priority in priorities:
-                priority_tasks = [
-                    task for task in tasks if task.priority_id == priority.id
-                ]
-                states_data = []
-                for state in states:
-                    state_tasks = [
-                        task for task in priority_tasks if task.state_id == state.id
-                    ]
-                    states_data.append(
-                        {
-                            **StateSerializer(state).data,
-                            "tasks": TaskSerializer(state_tasks, many=True).data,
-                        }
-                    )
-                results.append(
-                    {
-                        "group_key": priority.id,
-                        "states": states_data,
-                        "group_by": group_by,
-                        "priority": PrioritySerializer(priority).data,
-                    }
-                )
-            unprioritized_tasks = [task for task in tasks if task.priority_id is None]
-            states_data = []
-            for state in states:
-                state_tasks = [
-                    task for task in unprioritized_tasks if task.state_id == state.id
-                ]
-                states_data.append(
-                    {
-                        **StateSerializer(state).data,
-                        "tasks": TaskSerializer(state_tasks, many=True).data,
-                    }
-                )
-            results.append(
-                {
-                    "group_key": "no_priority",
-                    "states": states_data,
-                    "group_by": group_by,
-                    "priority": None,
-                }
-            )
+        buckets = KanbanBuckets(
+            request.board.states.all(), group_field=group_field, page_size=page_size
+        )
+        if page_size is not None:
+            # Only the first page of every column is loaded, the rest is
+            # fetched lazily through the kanban-column endpoint
+            buckets.set_counts(queryset.column_counts(group_field))
+            queryset = queryset.column_heads(page_size, group_field)
 
-        elif group_by == "task_type":
-            task_types = [choice[0] for choice in Task.TaskType.choices]
-            for task_type in task_types:
-                task_type_tasks = [
-                    task for task in tasks if task.task_type == task_type
-                ]
-                states_data = []
-                for state in states:
-                    state_tasks = [
-                        task for task in task_type_tasks if task.state_id == state.id
-                    ]
-                    states_data.append(
-                        {
-                            **StateSerializer(state).data,
-                            "tasks": TaskSerializer(state_tasks, many=True).data,
-                        }
-                    )
-                results.append(
-                    {
-                        "group_key": task_type,
-                        "states": states_data,
-                        "group_by": group_by,
-                        "task_type": dict(Task.TaskType.choices).get(task_type),
-                    }
-                )
+        if request.query_params.get("representation") == "compact":
+            buckets.fill_rows(queryset.compact())
+        else:
+            buckets.fill(queryset.for_read())
 
-        elif group_by == "estimate":
-            estimates = request.board.estimates.all()
-            for estimate in estimates:
-                estimate_tasks = [
-                    task for task in tasks if task.estimate_id == estimate.id
-                ]
-                states_data = []
-                for state in states:
-                    state_tasks = [
-                        task for task in estimate_tasks if task.state_id == state.id
-                    ]
-                    states_data.append(
-                        {
-                            **StateSerializer(state).data,
-                            "tasks": TaskSerializer(state_tasks, many=True).data,
-                        }
-                    )
-                results.append(
-                    {
-                        "group_key": estimate.id,
-                        "states": states_data,
-                        "group_by": group_by,
-                        "estimate": EstimateSerializer(estimate).data,
-                    }
-                )
-            unestimated_tasks = [task for task in tasks if task.estimate_id is None]
-            states_data = []
-            for state in states:
-                state_tasks = [
-                    task for task in unestimated_tasks if task.state_id == state.id
-                ]
-                states_data.append(
-                    {
-                        **StateSerializer(state).data,
-                        "tasks": TaskSerializer(state_tasks, many=True).data,
-                    }
-                )
-            results.append(
-                {
-                    "group_key": "no_estimate",
-                    "states": states_data,
-                    "group_by": group_by,
-                    "estimate": None,
-                }
-            )
+        results = build_kanban_results(request.board, buckets, group_by)
 
         response_data = {
             "results": results,
@@ -475,6 +417,69 @@ class TasksViewSet(BoardMixin, ViewSet):
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+    @action(methods=["GET"], detail=False, url_path="kanban-column")
+    @cache_board_snapshot
+    def kanban_column(self, request, *args, **kwargs):
+        state_id = request.query_params.get("state_id")
+        if not state_id:
+            raise InvalidInputException
+
+        group_filter = get_group_filter(
+            request.query_params.get("group_by", None),
+            request.query_params.get("group_key", None),
+        )
+        queryset = self.get_kanban_queryset(request).filter(
+            state_id=state_id, **group_filter
+        )
+
+        compact = request.query_params.get("representation") == "compact"
+        if compact:
+            queryset = queryset.compact()
+        else:
+            queryset = queryset.for_read()
+
+        page_size = get_page_size(request, default=DEFAULT_PAGE_SIZE)
+        tasks, next_cursor = CursorPaginator(COLUMN_ORDERING, page_size).paginate(
+            queryset, request.query_params.get("cursor")
+        )
+
+        if compact:
+            results = list(tasks)
+        else:
+            results = TaskSerializer(tasks, many=True).data
+
+        response_data = {
+            "results": results,
+            "next_cursor": next_cursor,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False)
+    def changes(self, request, *args, **kwargs):
+        """
+        Delta sync: the tasks upserted and deleted since the `since` token,
+        read from the trigger maintained change log.
+        """
+        data = get_task_changes(request.board, request.query_params.get("since"))
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False)
+    def search(self, request, *args, **kwargs):
+        query = request.query_params.get("q")
+        if not query:
+            return Response(
+                data={"detail": "Please enter search query."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        tasks = search_tasks(
+            Task.objects.filter(board=request.board),
+            query,
+            limit=get_page_size(request, default=SEARCH_PAGE_SIZE),
+        )
+        serializer = TaskSearchResultSerializer(tasks, many=True)
+        return Response(data={"results": serializer.data}, status=status.HTTP_200_OK)
+
     @transaction.atomic
     def partial_update(self, request, *args, **kwargs):
         update_serializer = TaskUpdateSerializer(data=request.data)
@@ -482,138 +487,20 @@ class TasksViewSet(BoardMixin, ViewSet):
             raise InvalidInputException
 
         task = get_object_or_raise_api_404(
-            Task, board=request.board, id=kwargs.get("pk"), message="Task not found."
+            Task.objects.select_related(*TaskChangeSet.TASK_RELATIONS),
+            board=request.board,
+            id=kwargs.get("pk"),
+            message="Task not found.",
         )
 
-        data = update_serializer.validated_data
-        task_updates = []
-        assignee_ids = None
-        if data.get("assignee_ids"):
-            assignee_ids = data.pop("assignee_ids")
-        for key, value in data.items():
-            if key == "estimate_id":
-                estimate = get_object_or_raise_api_404(
-                    Estimate, board=request.board, id=value
-                )
-                if task.estimate:
-                    task_updates.append(
-                        f"changed estimate from {task.estimate.value} to {estimate.value}"
-                    )
-                else:
-                    task_updates.append(f"has set estimate as {estimate.value}")
-            if key == "priority_id":
-                if not value:
-                    task_updates.append(f"removed priority {task.priority.name}.")
-                else:
-                    priority = get_object_or_raise_api_404(
-                        Priority, board=request.board, id=value
-                    )
-                    if task.priority:
-                        task_updates.append(
-                            f"changed priority from {task.priority.name} to {priority.name}."
-                        )
-                    else:
-                        task_updates.append(f"has set task priority as {priority.name}")
-
-            if key == "assignee_id":
-                if not value:
-                    task_updates.append(
-                        f"removed assignee {task.assignee.display_name}."
-                    )
-                else:
-                    assignee = request.board.members.filter(id=value).first()
-                    if task.assignee:
-                        task_updates.append(
-                            f"changed assignee from {task.assignee.display_name} to {assignee.display_name}."
-                        )
-                    else:
-                        task_updates.append(f"assigned to {assignee.display_name}.")
-
-            if key == "task_type":
-                task_updates.append(
-                    f"changed task type from {task.task_type} to {value}."
-                )
-
-            if key == "state_id":
-                state = get_object_or_raise_api_404(
-                    State, board=request.board, id=value
-                )
-                task_updates.append(
-                    f"changed state from {task.state.name} to {state.name}."
-                )
-                today = timezone.now().date()
-                snapshot, created = TaskSnapshot.objects.get_or_create(
-                    task=task, date=today, defaults={"state": state}
-                )
-                if not created:
-                    snapshot.state = state
-                    snapshot.save(update_fields=["state"])
-
-            if key == "sprint_id":
-                if value:
-                    sprint = get_object_or_raise_api_404(
-                        Sprint, board=request.board, id=value
-                    )
-                    if not task.sprint:
-                        task_updates.append(f"added to sprint {sprint.name}.")
-                    else:
-                        task_updates.append(f"moved to sprint {sprint.name}.")
-                else:
-                    task_updates.append(f"removed from sprint {task.sprint.name}.")
-
-            if key == "description":
-                TaskComment.objects.create(
-                    task=task,
-                    content="updated the description.",
-                    author=request.user,
-                    comment_type=TaskComment.CommentType.ACTIVITY,
-                )
-                task_updates.append(f"updated description.")
-
-            if key == "summary":
-                task_updates.append(f"updated summary.")
-
-            setattr(task, key, value)
-        task.save(update_fields=data.keys())
-
-        if "description" in data:
-            task.description_raw = strip_tags(data["description"])
-            task.save(update_fields=["description_raw"])
-
-        if assignee_ids:
-            current_assignees = set(task.assignees.values_list("id", flat=True))
-            new_assignees = set(assignee_ids)
-            added_assignees = new_assignees - current_assignees
-            removed_assignees = current_assignees - new_assignees
-
-            if added_assignees or removed_assignees:
-                task.assignees.set(task.board.members.filter(id__in=assignee_ids))
-                if added_assignees:
-                    added_names = ", ".join(
-                        task.board.members.filter(id__in=added_assignees).values_list(
-                            "display_name", flat=True
-                        )
-                    )
-                    task_updates.append(f"added assignees: {added_names}")
+        change_set = TaskChangeSet(
+            task, request.board, request.user, update_serializer.validated_data
+        )
+        comment = change_set.apply()
 
-                if removed_assignees:
-                    removed_names = ", ".join(
-                        task.board.members.filter(id__in=removed_assignees).values_list(
-                            "display_name", flat=True
-                        )
-                    )
-                    task_updates.append(f"removed assignees: {removed_names}")
-
-        if task_updates:
-            comment = TaskComment.objects.create(
-                task=task,
-                content=", ".join(task_updates),
-                author=request.user,
-                comment_type=TaskComment.CommentType.ACTIVITY,
-            )
         response_data = {
             "detail": "Task updated successfully.",
-            "log": TaskCommentSerializer(comment).data,
+            "log": TaskCommentSerializer(comment).data if comment else None,
         }
         return Response(
             data=response_data,
@@ -628,46 +515,41 @@ class TasksViewSet(BoardMixin, ViewSet):
         task = get_object_or_raise_api_404(
             Task, board=request.board, id=kwargs.get("pk")
         )
-        old_state = task.state
         data = update_serializer.validated_data
 
-        if data.get("previous_task") and data.get("next_task"):
-            previous_task = get_object_or_raise_api_404(
-                Task, board=request.board, id=data.get("previous_task")
-            )
-            next_task = get_object_or_raise_api_404(
-                Task, board=request.board, id=data.get("next_task")
-            )
-            task.sequence = (previous_task.sequence + next_task.sequence) / 2
-
-        elif data.get("previous_task"):
-            previous_task = get_object_or_raise_api_404(
-                Task, board=request.board, id=data.get("previous_task")
-            )
-            task.sequence = previous_task.sequence + 10000
-
-        elif data.get("next_task"):
-            next_task = get_object_or_raise_api_404(
-                Task, board=request.board, id=data.get("next_task")
-            )
-            task.sequence = next_task.sequence / 2
-
         # Check for valid state Id and Update State Task Log
-        if data.get("state_id"):
-            state = get_object_or_raise_api_404(
-                State, board=request.board, id=data.get("state_id")
-            )
-            if old_state != state:
-                today = timezone.now().date()
-                snapshot, created = TaskSnapshot.objects.get_or_create(
-                    task=task, date=today, defaults={"state": state}
-                )
-                if not created:
-                    snapshot.state = state
-                    snapshot.save(update_fields=["state"])
+        state = get_object_or_raise_api_404(
+            State, board=request.board, id=data.get("state_id")
+        )
 
-        task.state_id = data.get("state_id")
-        task.save(update_fields=["state_id", "sequence"])
+        neighbours = Task.objects.filter(board=request.board)
+
+        def get_neighbour_sequence(key):
+            if not data.get(key):
+                return None
+            return get_object_or_raise_api_404(neighbours, id=data.get(key)).sequence
+
+        # Without neighbours the task keeps its sequence
+        if data.get("previous_task") or data.get("next_task"):
+            previous_sequence = get_neighbour_sequence("previous_task")
+            next_sequence = get_neighbour_sequence("next_task")
+            task.sequence = sequence_between(previous_sequence, next_sequence)
+
+            column = neighbours.filter(state_id=state.id)
+            if has_sequence_collision(task.sequence, previous_sequence, next_sequence):
+                # Out of precision between the neighbours, renumber the column
+                rebalance_sequences(column)
+                previous_sequence = get_neighbour_sequence("previous_task")
+                next_sequence = get_neighbour_sequence("next_task")
+                task.sequence = sequence_between(previous_sequence, next_sequence)
+            elif needs_rebalance(task.sequence, previous_sequence, next_sequence):
+                schedule_task_rebalance(request.board.id, state.id)
+
+        transition = StateTransition(state)
+        state_changed = transition.move(task)
+        task.save(update_fields=["state_id", "sequence", "completed_at"])
+        if state_changed:
+            transition.record([task])
         return Response(
             data={"detail": "Task sequence updated", "new_sequence": task.sequence},
             status=status.HTTP_200_OK,
@@ -725,43 +607,14 @@ class TasksViewSet(BoardMixin, ViewSet):
             )
 
         state = get_object_or_raise_api_404(State, board=request.board, id=state_id)
-        tasks = Task.objects.filter(board=request.board, id__in=task_ids)
-
-        # Find the last task in the new state
-        last_task_in_state = (
-            Task.objects.filter(board=request.board, state=state)
-            .order_by("-sequence")
-            .first()
-        )
-        new_sequence = (
-            last_task_in_state.sequence + 10000 if last_task_in_state else 10000
+        tasks = move_tasks_to_state(
+            Task.objects.for_read().filter(board=request.board, id__in=task_ids),
+            state,
+            request.user,
         )
+        serializer = TaskSerializer(tasks, many=True)
 
-        task_comments = []
-        for task in tasks:
-            task.state_id = state.id
-            task.sequence = new_sequence
-            task.save(update_fields=["state_id", "sequence"])
-            new_sequence += 10000
-
-            # Create a TaskComment for each task
-            task_comments.append(
-                TaskComment(
-                    task=task,
-                    content=f"state changed to {state.name}",
-                    comment_type="activity",
-                    author=request.user,
-                )
-            )
-
-        # Use bulk update to save all tasks at once
-        Task.objects.bulk_update(tasks, ["state_id", "sequence"])
-        TaskComment.objects.bulk_create(task_comments)
-
-        new_tasks = Task.objects.filter(board=request.board, id__in=task_ids)
-        serializer = TaskSerializer(new_tasks, many=True)
-
-        task_names = ", ".join(task.name for task in new_tasks)
+        task_names = ", ".join(task.name for task in tasks)
         return Response(
             data={
                 "detail": f"Tasks ({task_names}) state changed to {state.name}",
@@ -786,36 +639,16 @@ class TasksViewSet(BoardMixin, ViewSet):
                 state = get_object_or_raise_api_404(
                     State, board=request.board, id=data.get("value")
                 )
-                last_task_in_state = (
-                    Task.objects.filter(board=request.board, state=state)
-                    .order_by("-sequence")
-                    .first()
-                )
-                new_sequence = (
-                    last_task_in_state.sequence + 10000 if last_task_in_state else 10000
-                )
-                for task in tasks:
-                    task.state_id = state.id
-                    task.sequence = new_sequence
-                    new_sequence += 10000
-
-                    # Create a TaskComment for each task
-                    task_comments.append(
-                        TaskComment(
-                            task=task,
-                            content=f"state changed to {state.name}",
-                            comment_type="activity",
-                            author=request.user,
-                        )
-                    )
-                Task.objects.bulk_update(tasks, ["state_id", "sequence"])
+                tasks = move_tasks_to_state(tasks, state, request.user)
 
             case "sprint":
                 sprint = get_object_or_raise_api_404(
                     Sprint, board=request.board, id=data.get("value")
                 )
+                now = timezone.now()
                 for task in tasks:
                     task.sprint_id = sprint.id
+                    task.updated_at = now
 
                     # Create a TaskComment for each task
                     task_comments.append(
@@ -826,13 +659,24 @@ class TasksViewSet(BoardMixin, ViewSet):
                             author=request.user,
                         )
                     )
-                Task.objects.bulk_update(tasks, ["sprint_id"])
+                Task.objects.bulk_update(tasks, ["sprint_id", "updated_at"])
+                UserTaskIndex.objects.sync(task.id for task in tasks)
+
+                publish_task_events(
+                    request.board.id, TASK_UPDATED, [task.id for task in tasks]
+                )
 
         TaskComment.objects.bulk_create(task_comments)
+        # bulk_update skips the post_save signals that version the board,
+        # refresh the sprint rollups and the users' task index
+        bump_board_version_on_commit(request.board.id)
+        schedule_sprint_stats_refresh(request.board.id)
+
+        # Subscribed clients receive the changed tasks over the board events
         task_names = ", ".join(task.name for task in tasks)
         return Response(
             data={
-                "detail": f"Tasks ({task_names}) updated successfully. Please refresh the page to see the changes.",
+                "detail": f"Tasks ({task_names}) updated successfully.",
             },
             status=status.HTTP_200_OK,
         )
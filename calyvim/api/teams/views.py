@@ -9,6 +9,12 @@ from calyvim.exceptions import InvalidInputException, TeamNotFoundException
 from calyvim.models.team import Team
 from calyvim.mixins import WorkspaceMixin
 from calyvim.permissions import WorkspaceGenericPermission
+from calyvim.utils import (
+    normalize_typeahead_query,
+    get_typeahead_limit,
+    typeahead,
+    cached_typeahead,
+)
 
 
 class TeamsViewSet(WorkspaceMixin, ViewSet):
@@ -73,11 +79,23 @@ class TeamsViewSet(WorkspaceMixin, ViewSet):
     @action(methods=["GET"], detail=False)
     def search(self, request, *args, **kwargs):
         query = request.query_params.get("q")
-        if not query:
+        if not query or not query.strip():
             return Response(
                 data={"detail": "Please enter search query."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        teams = request.workspace.teams.filter(name__icontains=query)
-        serializer = TeamSerializer(teams, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        query = normalize_typeahead_query(query)
+        limit = get_typeahead_limit(request)
+
+        def build():
+            teams = typeahead(
+                request.workspace.teams.prefetch_related("members"),
+                ["name"],
+                query,
+                limit,
+            )
+            return list(TeamSerializer(teams, many=True).data)
+
+        data = cached_typeahead(request.workspace.id, "teams", query, limit, build)
+        return Response(data=data, status=status.HTTP_200_OK)
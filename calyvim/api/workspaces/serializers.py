@@ -1,7 +1,15 @@
 from rest_framework import serializers
 
 from calyvim.mixins import NameAndSourceSerializerMixin
-from calyvim.models import Workspace, WorkspaceMembership, User
+from calyvim.models import (
+    Workspace,
+    WorkspaceMembership,
+    User,
+    Board,
+    State,
+    Task,
+    UserTaskIndex,
+)
 
 
 class MemberSerializer(serializers.ModelSerializer):
@@ -45,3 +53,49 @@ class WorkspaceUpdateSerializer(serializers.Serializer):
         required=False, allow_null=True, allow_blank=True
     )
     logo = serializers.CharField(required=False, allow_null=True)
+
+
+class MyWorkQuerySerializer(serializers.Serializer):
+    relation = serializers.ChoiceField(
+        choices=["assigned", "created"], required=False, allow_null=True
+    )
+    board_id = serializers.UUIDField(required=False, allow_null=True)
+
+
+class MyWorkBoardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Board
+        fields = ["id", "name", "task_prefix"]
+
+
+class MyWorkStateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = State
+        fields = ["id", "name", "category"]
+
+
+class MyWorkTaskSerializer(serializers.ModelSerializer):
+    state = MyWorkStateSerializer()
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "name",
+            "summary",
+            "task_type",
+            "state",
+            "priority_id",
+            "sprint_id",
+            "completed_at",
+            "created_at",
+        ]
+
+
+class MyWorkItemSerializer(serializers.ModelSerializer):
+    task = MyWorkTaskSerializer()
+    board = MyWorkBoardSerializer()
+
+    class Meta:
+        model = UserTaskIndex
+        fields = ["task", "board", "is_assignee", "is_creator", "task_updated_at"]
@@ -1,13 +1,33 @@
-from django.db.models import Q
+from django.db.models import Q, Count
 from rest_framework.viewsets import ViewSet
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from calyvim.utils import get_object_or_raise_api_404
-from calyvim.models import Workspace, WorkspaceMembership
+from calyvim.utils import (
+    get_object_or_raise_api_404,
+    normalize_typeahead_query,
+    get_typeahead_limit,
+    typeahead,
+    cached_typeahead,
+    get_page_size,
+    CursorPaginator,
+    DEFAULT_PAGE_SIZE,
+)
+from calyvim.models import (
+    Workspace,
+    WorkspaceMembership,
+    User,
+    Task,
+    UserTaskIndex,
+)
+from calyvim.permissions import visible_board_ids
+from calyvim.api.tasks.search import search_tasks, SEARCH_PAGE_SIZE
+from calyvim.api.tasks.serializers import TaskSearchResultSerializer
 from calyvim.api.workspaces.serializers import (
+    MyWorkQuerySerializer,
+    MyWorkItemSerializer,
     WorkspaceSerializer,
     WorkspaceMembershipSerializer,
     MemberSerializer,
@@ -18,6 +38,9 @@ from calyvim.exceptions import WorkspaceNotFoundException, InvalidInputException
 from calyvim.utils import update_file_field
 
 
+MEMBER_SEARCH_FIELDS = ["display_name", "username", "email", "first_name", "last_name"]
+
+
 class WorkspaceViewSet(ViewSet):
     permission_classes = [IsAuthenticated]
 
@@ -99,6 +122,39 @@ class WorkspaceViewSet(ViewSet):
             message="workspace not found.",
         )
 
+        query = request.query_params.get("q")
+        if not query or not query.strip():
+            return Response(
+                data={"detail": "Please enter search query."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        query = normalize_typeahead_query(query)
+        limit = get_typeahead_limit(request)
+
+        def build():
+            # One row per member through the unique (workspace, user) pair,
+            # no DISTINCT needed
+            members = typeahead(
+                User.objects.filter(workspace_memberships__workspace=workspace),
+                MEMBER_SEARCH_FIELDS,
+                query,
+                limit,
+            )
+            return list(MemberSerializer(members, many=True).data)
+
+        data = cached_typeahead(workspace.id, "members", query, limit, build)
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=True, url_path="tasks/search")
+    def tasks_search(self, request, *args, **kwargs):
+        workspace = get_object_or_raise_api_404(
+            Workspace,
+            memberships__user=request.user,
+            id=kwargs.get("pk"),
+            message="workspace not found.",
+        )
+
         query = request.query_params.get("q")
         if not query:
             return Response(
@@ -106,11 +162,68 @@ class WorkspaceViewSet(ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        members = workspace.members.filter(
-            Q(email__icontains=query)
-            | Q(username__icontains=query)
-            | Q(first_name__icontains=query)
-            | Q(last_name__icontains=query)
-        ).distinct()
-        serializer = MemberSerializer(members, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        tasks = search_tasks(
+            Task.objects.filter(
+                board_id__in=visible_board_ids(request.user.pk, workspace.id)
+            ),
+            query,
+            limit=get_page_size(request, default=SEARCH_PAGE_SIZE),
+        )
+        serializer = TaskSearchResultSerializer(tasks, many=True)
+        return Response(data={"results": serializer.data}, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=True, url_path="my-work")
+    def my_work(self, request, *args, **kwargs):
+        """
+        The tasks assigned to or created by the current user across the
+        workspace, most recently updated first, read from the per-user index.
+        """
+        workspace = get_object_or_raise_api_404(
+            Workspace,
+            memberships__user=request.user,
+            id=kwargs.get("pk"),
+            message="workspace not found.",
+        )
+
+        query_serializer = MyWorkQuerySerializer(data=request.query_params)
+        if not query_serializer.is_valid():
+            raise InvalidInputException
+        query = query_serializer.validated_data
+
+        # Rows of boards the user has lost access to are skipped, not deleted
+        queryset = UserTaskIndex.objects.filter(
+            user=request.user,
+            workspace=workspace,
+            is_archived=False,
+            board_id__in=visible_board_ids(request.user.pk, workspace.id),
+        )
+        if query.get("board_id"):
+            queryset = queryset.filter(board_id=query["board_id"])
+
+        counts = queryset.aggregate(
+            assigned=Count("id", filter=Q(is_assignee=True)),
+            created=Count("id", filter=Q(is_creator=True)),
+        )
+
+        match query.get("relation"):
+            case "assigned":
+                queryset = queryset.filter(is_assignee=True)
+            case "created":
+                queryset = queryset.filter(is_creator=True)
+
+        page_size = get_page_size(request, default=DEFAULT_PAGE_SIZE)
+        rows, next_cursor = CursorPaginator(
+            ("-task_updated_at", "-id"), page_size
+        ).paginate(
+            queryset.select_related("task__state", "board"),
+            request.query_params.get("cursor"),
+        )
+
+        return Response(
+            data={
+                "counts": counts,
+                "results": MyWorkItemSerializer(rows, many=True).data,
+                "next_cursor": next_cursor,
+            },
+            status=status.HTTP_200_OK,
+        )
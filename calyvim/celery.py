@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "calyvim.settings.development")
@@ -15,3 +16,18 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
+
+app.conf.beat_schedule = {
+    "reconcile-sprint-daily-stats": {
+        "task": "calyvim.tasks.sprint.reconcile_sprint_daily_stats",
+        "schedule": crontab(hour=0, minute=30),
+    },
+    "refresh-board-analytics": {
+        "task": "calyvim.tasks.analytics.refresh_board_analytics",
+        "schedule": crontab(minute="*/15"),
+    },
+    "prune-task-changes": {
+        "task": "calyvim.tasks.changes.prune_task_changes",
+        "schedule": crontab(hour=1, minute=0),
+    },
+}
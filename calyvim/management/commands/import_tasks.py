@@ -0,0 +1,179 @@
+import csv
+import json
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import is_naive, make_aware
+
+from calyvim.models import Board, User, State, Priority, Label, Sprint
+from calyvim.api.tasks.bulk import TaskBulkCreator, BULK_BATCH_SIZE
+
+
+DATETIME_FORMATS = ("%a, %d %b %Y %H:%M:%S %Z%z", "%a, %d %b %Y %H:%M:%S")
+DATE_FORMAT = "%a, %d %b %Y"
+
+
+def parse_datetime(value):
+    if not value:
+        return None
+    for date_format in DATETIME_FORMATS:
+        try:
+            parsed = datetime.strptime(value.strip(), date_format)
+        except ValueError:
+            continue
+        return make_aware(parsed) if is_naive(parsed) else parsed
+    return None
+
+
+def parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.strip(), DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def split_names(value):
+    if not value:
+        return []
+    names = (name.strip() for name in value.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import tasks into a board from a JSON or CSV export "
+        "(the formester.json format: Name, Description, State, Priority, "
+        "Created By, Assignee, Labels, Cycle Name, ...)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_id", type=str, help="Id of the board to import into")
+        parser.add_argument("path", type=str, help="Path of the JSON or CSV file")
+        parser.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            help="File format, guessed from the file extension when omitted",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BULK_BATCH_SIZE,
+            help="Number of tasks written per bulk insert",
+        )
+
+    def read_rows(self, path, file_format):
+        file_format = file_format or ("csv" if path.endswith(".csv") else "json")
+        with open(path, newline="") as file:
+            if file_format == "csv":
+                return list(csv.DictReader(file))
+            return json.load(file)
+
+    def get_or_create_by_name(self, model, board, names):
+        # A handful of distinct names per import, one round trip each at most
+        existing = {
+            instance.name: instance
+            for instance in model.objects.filter(board=board, name__in=names)
+        }
+        for name in names:
+            if name not in existing:
+                existing[name] = model.objects.create(board=board, name=name)
+        return existing
+
+    def get_sprints(self, board, rows):
+        sprints = {
+            sprint.name: sprint
+            for sprint in Sprint.all_objects.filter(
+                board=board, name__in={row.get("Cycle Name") for row in rows}
+            )
+        }
+        for row in rows:
+            name = row.get("Cycle Name")
+            start_date = parse_date(row.get("Cycle Start Date"))
+            end_date = parse_date(row.get("Cycle End Date"))
+            if name and name not in sprints and start_date and end_date:
+                sprints[name] = Sprint.objects.create(
+                    board=board, name=name, start_date=start_date, end_date=end_date
+                )
+        return sprints
+
+    def handle(self, *args, **options):
+        board = Board.objects.filter(id=options["board_id"]).first()
+        if board is None:
+            raise CommandError(f'Board "{options["board_id"]}" does not exist')
+
+        try:
+            rows = self.read_rows(options["path"], options["format"])
+        except (OSError, ValueError, csv.Error) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        started_at = time.perf_counter()
+
+        states = self.get_or_create_by_name(
+            State, board, {row["State"] for row in rows if row.get("State")}
+        )
+        priorities = self.get_or_create_by_name(
+            Priority, board, {row["Priority"] for row in rows if row.get("Priority")}
+        )
+        labels = self.get_or_create_by_name(
+            Label,
+            board,
+            {name for row in rows for name in split_names(row.get("Labels"))},
+        )
+        sprints = self.get_sprints(board, rows)
+
+        user_names = {
+            name
+            for row in rows
+            for name in split_names(row.get("Assignee")) + [row.get("Created By")]
+            if name
+        }
+        users = {
+            user.display_name: user
+            for user in User.objects.filter(display_name__in=user_names)
+        }
+
+        creator = TaskBulkCreator(board, author=None, batch_size=options["batch_size"])
+        skipped = 0
+        for row in rows:
+            if not row.get("Name"):
+                skipped += 1
+                continue
+
+            assignees = [
+                users[name]
+                for name in split_names(row.get("Assignee"))
+                if name in users
+            ]
+            archived_at = parse_datetime(row.get("Archived At"))
+            creator.add(
+                summary=row["Name"][:225],
+                description=row.get("Description"),
+                state=states.get(row.get("State")),
+                priority=priorities.get(row.get("Priority")),
+                sprint=sprints.get(row.get("Cycle Name")),
+                created_by=users.get(row.get("Created By")),
+                assignee=assignees[0] if assignees else None,
+                completed_at=parse_datetime(row.get("Completed At")),
+                archived_at=archived_at,
+                is_archived=archived_at is not None,
+                assignee_ids=[user.id for user in assignees],
+                label_ids=[labels[name].id for name in split_names(row.get("Labels"))],
+            )
+
+        tasks = creator.save()
+        elapsed = time.perf_counter() - started_at
+        rate = len(tasks) / elapsed if elapsed else len(tasks)
+
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {skipped} rows without a name.")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(tasks)} tasks into {board.name} in {elapsed:.2f}s "
+                f"({rate:.0f} tasks/sec)."
+            )
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.1 on 2026-10-18 10:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently so writes to tasks are not blocked
+    atomic = False
+
+    dependencies = [
+        ("calyvim", "0023_alter_task_name"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["board", "state", "sequence", "id"],
+                name="task_column_sequence_idx",
+            ),
+        ),
+    ]
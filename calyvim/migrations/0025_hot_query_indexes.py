@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-18 11:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so writes to the tables are not blocked
+    atomic = False
+
+    dependencies = [
+        ("calyvim", "0024_task_task_column_sequence_idx"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["board", "parent", "sprint", "state", "sequence"],
+                name="task_board_tree_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="taskcomment",
+            index=models.Index(
+                fields=["task", "comment_type", "-created_at", "-id"],
+                name="task_comment_feed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="tasksnapshot",
+            index=models.Index(fields=["date", "task"], name="task_snapshot_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="boardpermission",
+            index=models.Index(
+                fields=["user", "board", "role"], name="board_permission_role_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="workspacemembership",
+            index=models.Index(
+                fields=["user", "workspace", "role"],
+                name="workspace_membership_role_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1 on 2026-10-18 12:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0025_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SprintDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField()),
+                ("total_count", models.IntegerField(default=0)),
+                ("open_count", models.IntegerField(default=0)),
+                ("active_count", models.IntegerField(default=0)),
+                ("completed_count", models.IntegerField(default=0)),
+                ("total_estimate", models.FloatField(default=0)),
+                ("completed_estimate", models.FloatField(default=0)),
+                (
+                    "sprint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="calyvim.sprint",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sprint_daily_stats",
+                "ordering": ("date",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("sprint", "date"), name="unique_sprint_daily_stat"
+                    )
+                ],
+            },
+        ),
+    ]
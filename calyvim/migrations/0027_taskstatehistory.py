@@ -0,0 +1,94 @@
+# Generated by Django 5.1 on 2026-10-18 13:00
+
+import calyvim.models.task
+import django.db.models.deletion
+import uuid
+from django.contrib.postgres.indexes import GistIndex
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+# Seeds the intervals from the existing daily snapshots, each snapshot is
+# valid until the next snapshot of the same task.
+BACKFILL_SQL = """
+INSERT INTO task_state_history
+    (id, created_at, updated_at, task_id, board_id, state_id, valid_from, valid_to)
+SELECT
+    gen_random_uuid(), NOW(), NOW(), snapshots.task_id, tasks.board_id,
+    snapshots.state_id, snapshots.date::timestamptz,
+    LEAD(snapshots.date::timestamptz) OVER (
+        PARTITION BY snapshots.task_id ORDER BY snapshots.date
+    )
+FROM task_snapshots AS snapshots
+INNER JOIN tasks ON tasks.id = snapshots.task_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0026_sprintdailystat"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name="TaskStateHistory",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("valid_from", models.DateTimeField()),
+                ("valid_to", models.DateTimeField(blank=True, null=True)),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_state_history",
+                        to="calyvim.board",
+                    ),
+                ),
+                (
+                    "state",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_state_history",
+                        to="calyvim.state",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="state_history",
+                        to="calyvim.task",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "task_state_history",
+                "ordering": ("valid_from",),
+                "indexes": [
+                    GistIndex(
+                        models.F("board"),
+                        calyvim.models.task.TsTzRange("valid_from", "valid_to"),
+                        name="task_state_history_period_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("valid_to__isnull", True)),
+                        fields=["task"],
+                        name="task_state_history_open_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
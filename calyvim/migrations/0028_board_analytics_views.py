@@ -0,0 +1,139 @@
+# Generated by Django 5.1 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+# A task counts towards a day in the state it was in at the end of that day,
+# the current interval counts up to today.
+CUMULATIVE_FLOW_SQL = """
+CREATE MATERIALIZED VIEW board_cumulative_flow AS
+SELECT
+    MD5(history.board_id::text || days.day::date::text || states.category)::uuid
+        AS id,
+    history.board_id,
+    days.day::date AS day,
+    states.category,
+    COUNT(*) AS task_count
+FROM task_state_history AS history
+INNER JOIN states ON states.id = history.state_id
+INNER JOIN tasks ON tasks.id = history.task_id AND NOT tasks.is_archived
+CROSS JOIN LATERAL GENERATE_SERIES(
+    history.valid_from::date,
+    COALESCE(history.valid_to::date - 1, CURRENT_DATE),
+    INTERVAL '1 day'
+) AS days (day)
+GROUP BY history.board_id, days.day, states.category;
+
+CREATE UNIQUE INDEX board_cumulative_flow_id ON board_cumulative_flow (id);
+CREATE INDEX board_cumulative_flow_board_day
+    ON board_cumulative_flow (board_id, day);
+"""
+
+# Completion is the start of the current interval when it is in a completed
+# state, the start is the first time the task entered an active state.
+FLOW_TIMES_SQL = """
+CREATE MATERIALIZED VIEW task_flow_times AS
+SELECT
+    tasks.id AS task_id,
+    tasks.board_id,
+    tasks.created_at,
+    started.started_at,
+    completed.completed_at,
+    EXTRACT(EPOCH FROM completed.completed_at - started.started_at)
+        AS cycle_seconds,
+    EXTRACT(EPOCH FROM completed.completed_at - tasks.created_at) AS lead_seconds
+FROM tasks
+CROSS JOIN LATERAL (
+    SELECT MAX(history.valid_from) AS completed_at
+    FROM task_state_history AS history
+    INNER JOIN states ON states.id = history.state_id
+    WHERE history.task_id = tasks.id
+        AND history.valid_to IS NULL
+        AND states.category = 'completed'
+) AS completed
+CROSS JOIN LATERAL (
+    SELECT MIN(history.valid_from) AS started_at
+    FROM task_state_history AS history
+    INNER JOIN states ON states.id = history.state_id
+    WHERE history.task_id = tasks.id AND states.category = 'active'
+) AS started
+WHERE NOT tasks.is_archived AND completed.completed_at IS NOT NULL;
+
+CREATE UNIQUE INDEX task_flow_times_task_id ON task_flow_times (task_id);
+CREATE INDEX task_flow_times_board_completed_at
+    ON task_flow_times (board_id, completed_at);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0027_taskstatehistory"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CUMULATIVE_FLOW_SQL,
+            reverse_sql="DROP MATERIALIZED VIEW IF EXISTS board_cumulative_flow;",
+        ),
+        migrations.RunSQL(
+            FLOW_TIMES_SQL,
+            reverse_sql="DROP MATERIALIZED VIEW IF EXISTS task_flow_times;",
+        ),
+        migrations.CreateModel(
+            name="BoardCumulativeFlow",
+            fields=[
+                ("id", models.UUIDField(primary_key=True, serialize=False)),
+                ("day", models.DateField()),
+                ("category", models.CharField(max_length=24)),
+                ("task_count", models.IntegerField()),
+                (
+                    "board",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="calyvim.board",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "board_cumulative_flow",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="TaskFlowTime",
+            fields=[
+                (
+                    "task",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="calyvim.task",
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("completed_at", models.DateTimeField()),
+                ("cycle_seconds", models.FloatField(blank=True, null=True)),
+                ("lead_seconds", models.FloatField()),
+                (
+                    "board",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="calyvim.board",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "task_flow_times",
+                "managed": False,
+            },
+        ),
+    ]
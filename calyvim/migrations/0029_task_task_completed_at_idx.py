@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-18 15:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# completed_at was never maintained, derive it from the current state: tasks
+# in a completed state get the start of their current state interval.
+BACKFILL_SQL = """
+UPDATE tasks
+SET completed_at = CASE
+    WHEN states.category = 'completed' THEN COALESCE(
+        tasks.completed_at,
+        (
+            SELECT MAX(history.valid_from)
+            FROM task_state_history AS history
+            WHERE history.task_id = tasks.id AND history.valid_to IS NULL
+        ),
+        tasks.updated_at
+    )
+    ELSE NULL
+END
+FROM states
+WHERE states.id = tasks.state_id
+"""
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so writes to the tables are not blocked
+    atomic = False
+
+    dependencies = [
+        ("calyvim", "0028_board_analytics_views"),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("completed_at__isnull", False), ("is_archived", False)
+                ),
+                fields=["board", "completed_at"],
+                name="task_completed_at_idx",
+            ),
+        ),
+    ]
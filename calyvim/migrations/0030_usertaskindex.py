@@ -0,0 +1,109 @@
+# Generated by Django 5.1 on 2026-10-18 16:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Seeds the index from the assignee FK, the task_assignees rows and the creator
+# of every existing task.
+BACKFILL_SQL = """
+INSERT INTO user_task_index
+    (id, created_at, updated_at, user_id, task_id, board_id, workspace_id,
+     is_assignee, is_creator, task_updated_at, is_archived)
+SELECT
+    gen_random_uuid(), NOW(), NOW(), relations.user_id, tasks.id, tasks.board_id,
+    boards.workspace_id, BOOL_OR(relations.is_assignee),
+    BOOL_OR(NOT relations.is_assignee), tasks.updated_at, tasks.is_archived
+FROM (
+    SELECT id AS task_id, assignee_id AS user_id, TRUE AS is_assignee
+    FROM tasks WHERE assignee_id IS NOT NULL
+    UNION ALL
+    SELECT task_id, user_id, TRUE FROM task_assignees
+    UNION ALL
+    SELECT id, created_by_id, FALSE
+    FROM tasks WHERE created_by_id IS NOT NULL
+) AS relations
+INNER JOIN tasks ON tasks.id = relations.task_id
+INNER JOIN boards ON boards.id = tasks.board_id
+GROUP BY relations.user_id, tasks.id, boards.workspace_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0029_task_task_completed_at_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTaskIndex",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_assignee", models.BooleanField(default=False)),
+                ("is_creator", models.BooleanField(default=False)),
+                ("task_updated_at", models.DateTimeField()),
+                ("is_archived", models.BooleanField(default=False)),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="calyvim.board",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="calyvim.task",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_index",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "workspace",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="calyvim.workspace",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "user_task_index",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("is_archived", False)),
+                        fields=["user", "workspace", "-task_updated_at", "-id"],
+                        name="user_task_index_inbox_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "task"), name="unique_user_task_index"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1 on 2026-10-18 17:00
+
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+# Same vector as TaskQuerySet.refresh_search_vector
+BACKFILL_SQL = """
+UPDATE tasks SET search_vector =
+    setweight(to_tsvector('simple', COALESCE(tasks.name, '')), 'A')
+    || setweight(to_tsvector('simple', COALESCE(tasks.summary, '')), 'A')
+    || setweight(to_tsvector('simple', COALESCE(tasks.description_raw, '')), 'B')
+    || setweight(to_tsvector('simple', COALESCE((
+        SELECT STRING_AGG(comments.content, ' ')
+        FROM task_comments AS comments
+        WHERE comments.task_id = tasks.id AND comments.comment_type = 'update'
+    ), '')), 'C')
+"""
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently so writes to tasks are not blocked
+    atomic = False
+
+    dependencies = [
+        ("calyvim", "0030_usertaskindex"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name="task",
+            index=GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+        ),
+    ]
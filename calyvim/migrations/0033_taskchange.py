@@ -0,0 +1,123 @@
+# Generated by Django 5.1 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+# Columns a task update has to change to be logged, search vector refreshes
+# and updated_at only writes are not client visible changes.
+TASK_COLUMNS = [
+    "board_id",
+    "parent_id",
+    "state_id",
+    "priority_id",
+    "sprint_id",
+    "estimate_id",
+    "assignee_id",
+    "created_by_id",
+    "task_type",
+    "number",
+    "name",
+    "summary",
+    "description",
+    "sequence",
+    "start_date",
+    "end_date",
+    "links",
+    "checklists",
+    "completed_at",
+    "is_archived",
+]
+
+TRIGGERS_SQL = f"""
+CREATE FUNCTION log_task_change() RETURNS trigger AS $$
+DECLARE
+    task_row tasks%ROWTYPE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        task_row := OLD;
+    ELSE
+        task_row := NEW;
+    END IF;
+    INSERT INTO task_changes (board_id, task_id, txid, created_at)
+    VALUES (
+        task_row.board_id, task_row.id, pg_current_xact_id()::text::bigint, NOW()
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION log_task_relation_change() RETURNS trigger AS $$
+BEGIN
+    -- Skipped when the task itself is being deleted, that is logged already
+    INSERT INTO task_changes (board_id, task_id, txid, created_at)
+    SELECT tasks.board_id, tasks.id, pg_current_xact_id()::text::bigint, NOW()
+    FROM tasks
+    WHERE tasks.id = CASE WHEN TG_OP = 'DELETE' THEN OLD.task_id ELSE NEW.task_id END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_log_insert_delete
+AFTER INSERT OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION log_task_change();
+
+CREATE TRIGGER tasks_log_update
+AFTER UPDATE ON tasks
+FOR EACH ROW
+WHEN (
+    ({", ".join(f"OLD.{column}" for column in TASK_COLUMNS)})
+    IS DISTINCT FROM
+    ({", ".join(f"NEW.{column}" for column in TASK_COLUMNS)})
+)
+EXECUTE FUNCTION log_task_change();
+
+CREATE TRIGGER task_labels_log_change
+AFTER INSERT OR UPDATE OR DELETE ON task_labels
+FOR EACH ROW EXECUTE FUNCTION log_task_relation_change();
+
+CREATE TRIGGER task_assignees_log_change
+AFTER INSERT OR UPDATE OR DELETE ON task_assignees
+FOR EACH ROW EXECUTE FUNCTION log_task_relation_change();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS task_assignees_log_change ON task_assignees;
+DROP TRIGGER IF EXISTS task_labels_log_change ON task_labels;
+DROP TRIGGER IF EXISTS tasks_log_update ON tasks;
+DROP TRIGGER IF EXISTS tasks_log_insert_delete ON tasks;
+DROP FUNCTION IF EXISTS log_task_relation_change();
+DROP FUNCTION IF EXISTS log_task_change();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0032_typeahead_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("board_id", models.UUIDField()),
+                ("task_id", models.UUIDField()),
+                ("txid", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "task_changes",
+                "indexes": [
+                    models.Index(
+                        fields=["board_id", "txid"],
+                        name="task_change_board_txid_idx",
+                    ),
+                    models.Index(
+                        fields=["created_at"], name="task_change_created_at_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(TRIGGERS_SQL, reverse_sql=DROP_TRIGGERS_SQL),
+    ]
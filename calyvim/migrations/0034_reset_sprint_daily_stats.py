@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-18 20:00
+
+from django.db import migrations
+
+
+# Rows rolled up before estimates were summed in hours hold zero estimates,
+# they are rebuilt from the snapshots the next time a sprint is read
+RESET_SQL = "DELETE FROM sprint_daily_stats"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0033_taskchange"),
+    ]
+
+    operations = [
+        migrations.RunSQL(RESET_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
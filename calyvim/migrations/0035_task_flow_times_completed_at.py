@@ -0,0 +1,52 @@
+# Generated by Django 5.1 on 2026-10-18 21:00
+
+from importlib import import_module
+
+from django.db import migrations
+
+
+PREVIOUS_FLOW_TIMES_SQL = import_module(
+    "calyvim.migrations.0028_board_analytics_views"
+).FLOW_TIMES_SQL
+
+# Completion is tasks.completed_at, kept across moves between completed states,
+# the start is the first time the task entered an active state.
+FLOW_TIMES_SQL = """
+CREATE MATERIALIZED VIEW task_flow_times AS
+SELECT
+    tasks.id AS task_id,
+    tasks.board_id,
+    tasks.created_at,
+    started.started_at,
+    tasks.completed_at,
+    EXTRACT(EPOCH FROM tasks.completed_at - started.started_at) AS cycle_seconds,
+    EXTRACT(EPOCH FROM tasks.completed_at - tasks.created_at) AS lead_seconds
+FROM tasks
+CROSS JOIN LATERAL (
+    SELECT MIN(history.valid_from) AS started_at
+    FROM task_state_history AS history
+    INNER JOIN states ON states.id = history.state_id
+    WHERE history.task_id = tasks.id AND states.category = 'active'
+) AS started
+WHERE NOT tasks.is_archived AND tasks.completed_at IS NOT NULL;
+
+CREATE UNIQUE INDEX task_flow_times_task_id ON task_flow_times (task_id);
+CREATE INDEX task_flow_times_board_completed_at
+    ON task_flow_times (board_id, completed_at);
+"""
+
+DROP_FLOW_TIMES_SQL = "DROP MATERIALIZED VIEW IF EXISTS task_flow_times;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calyvim", "0034_reset_sprint_daily_stats"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            DROP_FLOW_TIMES_SQL + FLOW_TIMES_SQL,
+            reverse_sql=DROP_FLOW_TIMES_SQL + PREVIOUS_FLOW_TIMES_SQL,
+        ),
+    ]
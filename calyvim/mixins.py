@@ -2,10 +2,8 @@ from rest_framework import serializers
 from django.http import Http404
 
 from calyvim.models import (
-    Board,
     Workspace,
     WorkspaceMembership,
-    BoardPermission,
     BoardPermissionRole,
     Document,
     DocumentPermission,
@@ -17,6 +15,7 @@ from calyvim.exceptions import (
     DocumentNotFoundException,
 )
 from calyvim.utils import get_object_or_404
+from calyvim.permissions import resolve_board_access, get_board_roles, BoardAccess
 
 
 class FileUploadMixin:
@@ -26,15 +25,17 @@ class FileUploadMixin:
 
 
 class BoardMixin:
-    def initialize_request(self, request, *args, **kwargs):
-        request = super().initialize_request(request, *args, **kwargs)
+    def initial(self, request, *args, **kwargs):
+        # Resolved here rather than in initialize_request so the board, its
+        # workspace and the user's roles come from one memoized lookup that
+        # the board permission classes reuse.
         board_id = kwargs.get("board_id")
         if board_id:
-            board = Board.objects.filter(id=board_id).first()
-            if not board:
+            access = resolve_board_access(request, board_id)
+            if not access:
                 raise BoardNotFoundException
-            request.board = board
-        return request
+            request.board = access.board
+        return super().initial(request, *args, **kwargs)
 
 
 class DocumentMixin:
@@ -106,10 +107,8 @@ class PermissionCheckMixin:
             raise Http404
 
     def check_for_board_permission(self, board, user):
-        board_permission_queryset = BoardPermission.objects.filter(
-            board=board, user=user, role__in=["admin", "collaborator"]
-        )
-        if not board_permission_queryset.exists():
+        _, board_roles = get_board_roles(user.pk, board)
+        if not set(board_roles) & {"admin", "collaborator"}:
             raise Http404
 
     def check_and_get_workpace_permssion(self, workspace, user):
@@ -123,10 +122,8 @@ class PermissionCheckMixin:
         return workspace_membership
 
     def has_board_admin_permission(self, board, user):
-        permission_queryset = BoardPermission.objects.filter(
-            board=board, user=user, role="admin"
-        )
-        return permission_queryset.exists()
+        _, board_roles = get_board_roles(user.pk, board)
+        return "admin" in board_roles
 
 
 class WorkspacePermissionMixin:
@@ -155,14 +152,12 @@ class BoardPermissionMixin:
     def has_valid_board_permission(
         self, board, user, allowed_roles=BoardPermissionRole.values
     ):
-        membership = self.get_workspace_membership(board.workspace, user)
-        if membership.role == WorkspaceMembership.Role.ADMIN:
-            return True
+        workspace_role, board_roles = get_board_roles(user.pk, board)
+        if workspace_role is None:
+            raise Http404
 
-        permission_queryset = BoardPermission.objects.filter(
-            user=user, board=board, role__in=allowed_roles
-        )
-        return permission_queryset.exists()
+        access = BoardAccess(board, workspace_role, board_roles)
+        return access.has_board_role(allowed_roles)
 
 
 class DocumentPermissionMixin:
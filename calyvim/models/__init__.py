@@ -11,8 +11,11 @@ from .task import (
     TaskLabel,
     TaskAttachment,
     TaskSnapshot,
+    TaskStateHistory,
+    UserTaskIndex,
+    TaskChange,
 )
-from .sprint import Sprint
+from .sprint import Sprint, SprintDailyStat
 from .team import Team, TeamMembership
 from .label import Label
 from .estimate import Estimate
@@ -26,3 +29,4 @@ from .newsline import (
 from .document import Document, DocumentPermission, DocumentTeamPermission
 from .block import Block
 from .choice import BoardPermissionRole, DocumentPermissionRole
+from .analytics import BoardCumulativeFlow, TaskFlowTime
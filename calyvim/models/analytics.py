@@ -0,0 +1,47 @@
+from django.db import models
+
+
+class BoardCumulativeFlow(models.Model):
+    """
+    Read only model over the `board_cumulative_flow` materialized view: the
+    number of tasks per state category at the end of every day.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    board = models.ForeignKey(
+        "Board", on_delete=models.DO_NOTHING, related_name="+", db_constraint=False
+    )
+    day = models.DateField()
+    category = models.CharField(max_length=24)
+    task_count = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "board_cumulative_flow"
+
+
+class TaskFlowTime(models.Model):
+    """
+    Read only model over the `task_flow_times` materialized view: when every
+    completed task was created, first started and completed.
+    """
+
+    task = models.OneToOneField(
+        "Task",
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    board = models.ForeignKey(
+        "Board", on_delete=models.DO_NOTHING, related_name="+", db_constraint=False
+    )
+    created_at = models.DateTimeField()
+    started_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField()
+    cycle_seconds = models.FloatField(blank=True, null=True)
+    lead_seconds = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "task_flow_times"
@@ -1,4 +1,4 @@
-from django.db import models, IntegrityError
+from django.db import models, connection, IntegrityError
 
 # from django.utils.text import slugify
 from django.utils.crypto import get_random_string
@@ -126,6 +126,31 @@ class Board(UUIDTimestampModel):
     def metadata_cache_key(self):
         return f"board:{self.id}:metadata"
 
+    def reserve_task_numbers(self, count=1):
+        """
+        Atomically reserves a block of `count` consecutive task numbers and
+        returns them as a range.
+
+        The counter is incremented by the database in a single
+        UPDATE ... RETURNING, so concurrent creates never read the same value
+        and only the counter columns of the board row are written.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._meta.db_table} "
+                "SET task_number_counter = task_number_counter + %s, "
+                "tasks_count = tasks_count + %s "
+                "WHERE id = %s "
+                "RETURNING task_number_counter, task_prefix, tasks_count",
+                [count, count, self.id],
+            )
+            counter, task_prefix, tasks_count = cursor.fetchone()
+
+        self.task_number_counter = counter
+        self.task_prefix = task_prefix
+        self.tasks_count = tasks_count
+        return range(counter - count, counter)
+
 
 class BoardTeamPermission(UUIDTimestampModel):
     board = models.ForeignKey(
@@ -201,6 +226,12 @@ class BoardPermission(UUIDTimestampModel):
 
     class Meta:
         db_table = "board_permissions"
+        indexes = [
+            # Role lookups of a user on a board, answered index-only
+            models.Index(
+                fields=["user", "board", "role"], name="board_permission_role_idx"
+            ),
+        ]
 
     objects = models.Manager()
     user_objects = UserBoardPermissionManager()
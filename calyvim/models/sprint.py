@@ -41,3 +41,33 @@ class Sprint(UUIDTimestampModel):
     def archive(self):
         self.archived_at = timezone.now()
         self.save()
+
+
+class SprintDailyStat(UUIDTimestampModel):
+    """
+    Per day rollup of the tasks of a sprint, read by the burndown, burnup and
+    velocity charts instead of aggregating task snapshots.
+    """
+
+    sprint = models.ForeignKey(
+        "Sprint", on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField()
+    total_count = models.IntegerField(default=0)
+    open_count = models.IntegerField(default=0)
+    active_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    total_estimate = models.FloatField(default=0)
+    completed_estimate = models.FloatField(default=0)
+
+    class Meta:
+        db_table = "sprint_daily_stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sprint", "date"], name="unique_sprint_daily_stat"
+            ),
+        ]
+        ordering = ("date",)
+
+    def __str__(self) -> str:
+        return f"{self.sprint_id} {self.date}"
@@ -1,10 +1,142 @@
-from django.db import models, transaction
+import uuid
+from collections import defaultdict
+
+from django.db import models, connection, transaction
+from django.db.models import OuterRef, Subquery, F, Q, Func, Count, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
-from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.fields import ArrayField, DateTimeRangeField
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField, SearchRank
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
 
 from calyvim.models.base import UUIDTimestampModel
 
 
+# Language neutral: no stemming or stop words, so task keys like "CAL-12" and
+# non English text index as typed and prefix matching stays predictable.
+SEARCH_CONFIG = "simple"
+
+
+class TaskQuerySet(models.QuerySet):
+    # Relations read by the task API serializers, fetched up front so that
+    # serializing N tasks costs a constant number of queries.
+    READ_SELECT_RELATED = ("priority", "created_by", "estimate", "sprint", "assignee")
+    READ_PREFETCH_RELATED = ("assignees", "labels")
+
+    # Columns of the compact task projection, related objects are sent as IDs
+    # only and resolved by the client against the board metadata.
+    COMPACT_FIELDS = (
+        "id",
+        "parent_id",
+        "state_id",
+        "priority_id",
+        "sprint_id",
+        "estimate_id",
+        "assignee_id",
+        "created_by_id",
+        "task_type",
+        "number",
+        "name",
+        "summary",
+        "sequence",
+        "start_date",
+        "end_date",
+        "completed_at",
+        "created_at",
+    )
+
+    def for_read(self):
+        return self.select_related(*self.READ_SELECT_RELATED).prefetch_related(
+            *self.READ_PREFETCH_RELATED
+        )
+
+    def search(self, query):
+        """
+        Tasks matching a `SearchQuery` on the stored search vector, annotated
+        with their rank.
+        """
+        return self.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+
+    def refresh_search_vector(self):
+        """
+        Recomputes the stored search vector of the tasks in one UPDATE, for
+        paths that change names, descriptions or comments without a save.
+        """
+        comments = (
+            TaskComment.objects.filter(
+                task=OuterRef("pk"), comment_type=TaskComment.CommentType.UPDATE
+            )
+            .order_by()
+            .values("task")
+            .annotate(content=StringAgg("content", delimiter=" "))
+            .values("content")
+        )
+        return self.update(
+            search_vector=(
+                SearchVector("name", weight="A", config=SEARCH_CONFIG)
+                + SearchVector("summary", weight="A", config=SEARCH_CONFIG)
+                + SearchVector("description_raw", weight="B", config=SEARCH_CONFIG)
+                + SearchVector(Subquery(comments), weight="C", config=SEARCH_CONFIG)
+            )
+        )
+
+    def tail_sequence(self, board_id, state_id):
+        """
+        Sequence of the last task of a column, or None for an empty column.
+
+        Answered from the (board, state, sequence) index with a single
+        backward index-only probe instead of sorting the column.
+        """
+        return (
+            self.filter(board_id=board_id, state_id=state_id)
+            .order_by("-sequence")
+            .values_list("sequence", flat=True)
+            .first()
+        )
+
+    def column_counts(self, group_field=None):
+        """
+        Task counts per (state, group) column in a single aggregate query.
+        """
+        fields = ["state_id", group_field] if group_field else ["state_id"]
+        return self.order_by().values(*fields).annotate(count=Count("id"))
+
+    def column_heads(self, limit, group_field=None):
+        """
+        The first `limit` tasks of every (state, group) column, numbered with
+        ROW_NUMBER() so the cut happens in the database.
+        """
+        partition_by = [F("state_id")]
+        if group_field:
+            partition_by.append(F(group_field))
+        return self.annotate(
+            column_position=Window(
+                RowNumber(),
+                partition_by=partition_by,
+                order_by=[F("sequence").asc(), F("id").asc()],
+            )
+        ).filter(column_position__lte=limit)
+
+    def compact(self):
+        """
+        Plain dict rows for list payloads, built without model instances or
+        serializer fields. M2M IDs are collected with array subqueries.
+        """
+        return self.annotate(
+            assignee_ids=ArraySubquery(
+                TaskAssignee.objects.filter(task=OuterRef("pk")).values("user_id")
+            ),
+            label_ids=ArraySubquery(
+                TaskLabel.objects.filter(task=OuterRef("pk")).values("label_id")
+            ),
+        ).values(*self.COMPACT_FIELDS, "assignee_ids", "label_ids")
+
+
 class Task(UUIDTimestampModel):
     class TaskType(models.TextChoices):
         ISSUE = ("issue", "Issue")
@@ -12,11 +144,11 @@ class Task(UUIDTimestampModel):
         STORY = ("story", "Story")
         BUG = ("bug", "Bug")
 
-    class ActiveTaskManager(models.Manager):
+    class ActiveTaskManager(models.Manager.from_queryset(TaskQuerySet)):
         def get_queryset(self):
             return super().get_queryset().filter(is_archived=False)
 
-    class ArchivedTaskManager(models.Manager):
+    class ArchivedTaskManager(models.Manager.from_queryset(TaskQuerySet)):
         def get_queryset(self):
             return super().get_queryset().filter(is_archived=True)
 
@@ -71,6 +203,9 @@ class Task(UUIDTimestampModel):
     )
     completed_at = models.DateTimeField(blank=True, null=True)
 
+    # Weighted name, summary, description and comments, see refresh_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Archived
     is_archived = models.BooleanField(default=False, db_index=True)
     archived_at = models.DateTimeField(blank=True, null=True)
@@ -89,11 +224,32 @@ class Task(UUIDTimestampModel):
                 fields=["board", "name"], name="unique_task_name_per_board"
             )
         ]
+        indexes = [
+            # Column reads and appends: ordered by (sequence, id) per state
+            models.Index(
+                fields=["board", "state", "sequence", "id"],
+                condition=models.Q(is_archived=False),
+                name="task_column_sequence_idx",
+            ),
+            # List and kanban: active tasks of a board by parent and sprint
+            models.Index(
+                fields=["board", "parent", "sprint", "state", "sequence"],
+                condition=models.Q(is_archived=False),
+                name="task_board_tree_idx",
+            ),
+            # Throughput and "done this week" reports
+            models.Index(
+                fields=["board", "completed_at"],
+                condition=models.Q(is_archived=False, completed_at__isnull=False),
+                name="task_completed_at_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+        ]
         ordering = ("sequence",)
 
     objects = ActiveTaskManager()
     archived_objects = ArchivedTaskManager()
-    all_objects = models.Manager()
+    all_objects = TaskQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -101,26 +257,18 @@ class Task(UUIDTimestampModel):
     def save(self, *args, **kwargs):
         if self._state.adding:
             board = self.board
-            state = self.state
 
             if not self.name and not self.number:
                 # Get the last task sequence in the state
-                last_task_in_state = (
-                    Task.objects.filter(board=board, state=state)
-                    .order_by("-sequence")
-                    .first()
-                )
-                if last_task_in_state is not None:
-                    self.sequence = last_task_in_state.sequence + 10000
+                tail_sequence = Task.objects.tail_sequence(board.id, self.state_id)
+                if tail_sequence is not None:
+                    # Local import, calyvim.utils imports the models through tasks
+                    from calyvim.utils.ranking import SEQUENCE_STEP
 
-                self.number = board.task_number_counter
-                self.name = f"{board.task_prefix}-{board.task_number_counter}"
+                    self.sequence = tail_sequence + SEQUENCE_STEP
 
-                board.task_number_counter += 1
-                board.tasks_count += 1
-                board.save(
-                    update_fields=["task_number_counter", "task_prefix", "tasks_count"]
-                )
+                self.number = board.reserve_task_numbers()[0]
+                self.name = f"{board.task_prefix}-{self.number}"
         return super().save(*args, **kwargs)
 
     @transaction.atomic
@@ -172,6 +320,13 @@ class TaskComment(UUIDTimestampModel):
         verbose_name = "Task Comment"
         verbose_name_plural = "Task Comments"
         db_table = "task_comments"
+        indexes = [
+            # Comment and activity feeds of a task, newest first
+            models.Index(
+                fields=["task", "comment_type", "-created_at", "-id"],
+                name="task_comment_feed_idx",
+            ),
+        ]
 
     def __str__(self):
         return str(self.id)
@@ -218,5 +373,282 @@ class TaskSnapshot(UUIDTimestampModel):
 
     class Meta:
         db_table = "task_snapshots"
+        indexes = [
+            # Burndown date ranges, task_id included for the distinct counts
+            models.Index(fields=["date", "task"], name="task_snapshot_date_idx"),
+        ]
         unique_together = ["task", "date"]
         ordering = ["date"]
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class TaskStateHistoryQuerySet(models.QuerySet):
+    def with_period(self):
+        # Same expression as the GiST index, so range lookups can use it
+        return self.annotate(period=TsTzRange("valid_from", "valid_to"))
+
+    def at(self, moment):
+        """
+        Intervals that were current at `moment`.
+        """
+        return self.with_period().filter(period__contains=moment)
+
+    def during(self, start, end):
+        """
+        Intervals that overlap the half open range [start, end).
+        """
+        return self.with_period().filter(period__overlap=DateTimeTZRange(start, end))
+
+    def state_counts(self):
+        """
+        `{state_id: task count}` of the selected intervals.
+        """
+        return dict(
+            self.order_by()
+            .values("state_id")
+            .annotate(count=Count("task_id", distinct=True))
+            .values_list("state_id", "count")
+        )
+
+    def record(self, transitions, at=None):
+        """
+        Records `(task_id, board_id, state_id)` transitions. The open interval
+        of every task is closed and the new one opened in a single statement.
+        """
+        transitions = list(transitions)
+        if not transitions:
+            return
+        at = at or timezone.now()
+        table = self.model._meta.db_table
+
+        task_ids, board_ids, state_ids = zip(*transitions)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH closed AS (
+                    UPDATE {table} SET valid_to = %(at)s, updated_at = %(at)s
+                    WHERE task_id = ANY(%(task_ids)s::uuid[]) AND valid_to IS NULL
+                )
+                INSERT INTO {table}
+                    (id, created_at, updated_at, task_id, board_id, state_id,
+                     valid_from, valid_to)
+                SELECT opened.id, %(at)s, %(at)s, opened.task_id, opened.board_id,
+                    opened.state_id, %(at)s, NULL
+                FROM UNNEST(
+                    %(ids)s::uuid[], %(task_ids)s::uuid[], %(board_ids)s::uuid[],
+                    %(state_ids)s::uuid[]
+                ) AS opened (id, task_id, board_id, state_id)
+                """,
+                {
+                    "at": at,
+                    "ids": [uuid.uuid4() for _ in transitions],
+                    "task_ids": list(task_ids),
+                    "board_ids": list(board_ids),
+                    "state_ids": list(state_ids),
+                },
+            )
+
+
+class TaskStateHistory(UUIDTimestampModel):
+    """
+    The state of a task over time, one row per [valid_from, valid_to)
+    interval. The current interval of a task has no valid_to.
+    """
+
+    task = models.ForeignKey(
+        "Task", on_delete=models.CASCADE, related_name="state_history"
+    )
+    board = models.ForeignKey(
+        "Board", on_delete=models.CASCADE, related_name="task_state_history"
+    )
+    state = models.ForeignKey(
+        "State", on_delete=models.CASCADE, related_name="task_state_history"
+    )
+    valid_from = models.DateTimeField()
+    valid_to = models.DateTimeField(blank=True, null=True)
+
+    objects = TaskStateHistoryQuerySet.as_manager()
+
+    class Meta:
+        db_table = "task_state_history"
+        indexes = [
+            # Point in time and range queries of a board
+            GistIndex(
+                F("board"),
+                TsTzRange("valid_from", "valid_to"),
+                name="task_state_history_period_idx",
+            ),
+            # The open interval of a task, closed on the next transition
+            models.Index(
+                fields=["task"],
+                condition=models.Q(valid_to__isnull=True),
+                name="task_state_history_open_idx",
+            ),
+        ]
+        ordering = ("valid_from",)
+
+    def __str__(self) -> str:
+        return str(self.id)
+
+
+class UserTaskIndexQuerySet(models.QuerySet):
+    SYNC_FIELDS = [
+        "board",
+        "workspace",
+        "is_assignee",
+        "is_creator",
+        "task_updated_at",
+        "is_archived",
+    ]
+
+    def sync(self, task_ids):
+        """
+        Rebuilds the index rows of the given tasks from the assignee FK, the
+        assignees M2M and the creator, in a fixed number of queries.
+        """
+        task_ids = list(task_ids)
+        tasks = list(
+            Task.all_objects.filter(id__in=task_ids).values(
+                "id",
+                "board_id",
+                "board__workspace_id",
+                "assignee_id",
+                "created_by_id",
+                "updated_at",
+                "is_archived",
+            )
+        )
+        if not tasks:
+            return
+
+        assignees = defaultdict(set)
+        for task_id, user_id in TaskAssignee.objects.filter(
+            task_id__in=task_ids
+        ).values_list("task_id", "user_id"):
+            assignees[task_id].add(user_id)
+
+        rows = []
+        stale = Q()
+        for task in tasks:
+            assigned = set(assignees[task["id"]])
+            if task["assignee_id"]:
+                assigned.add(task["assignee_id"])
+            created = {task["created_by_id"]} if task["created_by_id"] else set()
+
+            for user_id in assigned | created:
+                rows.append(
+                    self.model(
+                        user_id=user_id,
+                        task_id=task["id"],
+                        board_id=task["board_id"],
+                        workspace_id=task["board__workspace_id"],
+                        is_assignee=user_id in assigned,
+                        is_creator=user_id in created,
+                        task_updated_at=task["updated_at"],
+                        is_archived=task["is_archived"],
+                    )
+                )
+            stale |= Q(task_id=task["id"]) & ~Q(user_id__in=assigned | created)
+
+        self.filter(stale).delete()
+        self.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["user", "task"],
+            update_fields=self.SYNC_FIELDS,
+        )
+
+
+class UserTaskIndex(UUIDTimestampModel):
+    """
+    Denormalized (user, task) rows for the tasks a user is assigned to or
+    created, so a user's work across a workspace is read from one index
+    instead of joining tasks, assignees and board permissions.
+    """
+
+    user = models.ForeignKey(
+        "User", on_delete=models.CASCADE, related_name="task_index"
+    )
+    task = models.ForeignKey("Task", on_delete=models.CASCADE, related_name="+")
+    board = models.ForeignKey("Board", on_delete=models.CASCADE, related_name="+")
+    workspace = models.ForeignKey(
+        "Workspace", on_delete=models.CASCADE, related_name="+"
+    )
+    is_assignee = models.BooleanField(default=False)
+    is_creator = models.BooleanField(default=False)
+    task_updated_at = models.DateTimeField()
+    is_archived = models.BooleanField(default=False)
+
+    objects = UserTaskIndexQuerySet.as_manager()
+
+    class Meta:
+        db_table = "user_task_index"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "task"], name="unique_user_task_index"
+            )
+        ]
+        indexes = [
+            # A user's active tasks in a workspace, most recently updated first
+            models.Index(
+                fields=["user", "workspace", "-task_updated_at", "-id"],
+                condition=models.Q(is_archived=False),
+                name="user_task_index_inbox_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.id)
+
+
+class TaskChangeQuerySet(models.QuerySet):
+    def horizon(self):
+        """
+        Oldest transaction ID still running. Every change logged by a lower
+        transaction ID is final (committed and visible, or rolled back), so
+        reading up to the horizon never skips a late committing change.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+            )
+            return cursor.fetchone()[0]
+
+    def between(self, board_id, since, until):
+        return self.filter(board_id=board_id, txid__gte=since, txid__lt=until)
+
+
+class TaskChange(models.Model):
+    """
+    Append-only log of the tasks touched by each transaction, written by
+    database triggers on tasks, task_labels and task_assignees so queryset
+    updates, bulk writes and raw SQL are all captured.
+
+    Board and task are plain IDs, the rows outlive deleted tasks and boards.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    board_id = models.UUIDField()
+    task_id = models.UUIDField()
+    txid = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskChangeQuerySet.as_manager()
+
+    class Meta:
+        db_table = "task_changes"
+        indexes = [
+            # Changes feed of a board between two transaction horizons
+            models.Index(
+                fields=["board_id", "txid"], name="task_change_board_txid_idx"
+            ),
+            # Retention pruning
+            models.Index(fields=["created_at"], name="task_change_created_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.id)
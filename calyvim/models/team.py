@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 
 from calyvim.models.base import UUIDTimestampModel
 
@@ -16,6 +18,13 @@ class Team(UUIDTimestampModel):
 
     class Meta:
         db_table = "teams"
+        indexes = [
+            # Team typeahead, `icontains` compares UPPER(name)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="team_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -4,6 +4,8 @@ from django.db import models, transaction
 from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.text import slugify
@@ -71,6 +73,17 @@ class User(UUIDTimestampModel, AbstractBaseUser):
 
     class Meta:
         db_table = "users"
+        indexes = [
+            # Member typeahead, `icontains` compares UPPER(column)
+            GinIndex(
+                OpClass(Upper("display_name"), name="gin_trgm_ops"),
+                OpClass(Upper("username"), name="gin_trgm_ops"),
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                OpClass(Upper("last_name"), name="gin_trgm_ops"),
+                name="user_search_trgm_idx",
+            ),
+        ]
 
     objects = UserManager()
     active_objects = ActiveUserManager()
@@ -88,6 +88,13 @@ class WorkspaceMembership(UUIDTimestampModel):
                 fields=["workspace", "user"], name="unqiue_user_per_workspace"
             )
         ]
+        indexes = [
+            # Role lookups of a user on a workspace, answered index-only
+            models.Index(
+                fields=["user", "workspace", "role"],
+                name="workspace_membership_role_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.id)
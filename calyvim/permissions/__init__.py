@@ -1,3 +1,3 @@
 from .workspace import *
 from .board import *
-
+from .resolver import *
@@ -1,54 +1,37 @@
 from rest_framework import permissions
 
-from calyvim.models import WorkspaceMembership, BoardPermission, BoardPermissionRole
+from calyvim.models import WorkspaceMembership, BoardPermissionRole
+from calyvim.permissions.resolver import get_board_access
 
 
 class BoardCollaboratorPermission(permissions.BasePermission):
     def has_permission(self, request, view):
-        workspace = request.board.workspace
+        access = get_board_access(request)
 
         # Check for workspace permission
-        workspace_membership = WorkspaceMembership.objects.filter(
-            workspace=workspace,
-            user=request.user,
-            role__in=[
-                WorkspaceMembership.Role.ADMIN,
-                WorkspaceMembership.Role.COLLABORATOR,
-            ],
-        ).first()
-
-        if workspace_membership.role == WorkspaceMembership.Role.ADMIN:
-            return True
+        if not access.has_workspace_role(
+            [WorkspaceMembership.Role.ADMIN, WorkspaceMembership.Role.COLLABORATOR]
+        ):
+            return False
 
         # Check for board collaborative permission
-        board_permission_queryset = BoardPermission.objects.filter(
-            board=request.board, user=request.user, role__in=["admin", "collaborator"]
+        return access.has_board_role(
+            [BoardPermissionRole.ADMIN, BoardPermissionRole.COLLABORATOR]
         )
-        return board_permission_queryset.exists()
 
 
 class BoardAdminPermission(permissions.BasePermission):
     def has_permission(self, request, view):
-        workspace = request.board.workspace
+        access = get_board_access(request)
 
         # Check for workspace permission
-        workspace_membership = WorkspaceMembership.objects.filter(
-            workspace=workspace,
-            user=request.user,
-            role__in=[
-                WorkspaceMembership.Role.ADMIN,
-                WorkspaceMembership.Role.COLLABORATOR,
-            ],
-        ).first()
-
-        if workspace_membership.role == WorkspaceMembership.Role.ADMIN:
-            return True
+        if not access.has_workspace_role(
+            [WorkspaceMembership.Role.ADMIN, WorkspaceMembership.Role.COLLABORATOR]
+        ):
+            return False
 
-        # Check for board collaborative permission
-        board_permission_queryset = BoardPermission.objects.filter(
-            board=request.board, user=request.user, role="admin"
-        )
-        return board_permission_queryset.exists()
+        # Check for board admin permission
+        return access.has_board_role([BoardPermissionRole.ADMIN])
 
 
 class BoardGenericPermission(permissions.BasePermission):
@@ -56,19 +39,6 @@ class BoardGenericPermission(permissions.BasePermission):
         self.allowed_roles = allowed_roles
 
     def has_permission(self, request, view):
-        # Check for workspace permission for admin roles
-        workspace_membership = WorkspaceMembership.objects.filter(
-            user=request.user, workspace=request.board.workspace
-        ).first()
-        if not workspace_membership:
-            return False
-
-        if workspace_membership.role == WorkspaceMembership.Role.ADMIN:
-            return True
-
-        # Check for board memberships
-        board_permission_queryset = BoardPermission.objects.filter(
-            user=request.user, board=request.board, role__in=self.allowed_roles
-        )
-
-        return board_permission_queryset.exists()
+        # Workspace admins have access to every board of the workspace,
+        # everyone else needs one of the allowed board roles
+        return get_board_access(request).has_board_role(self.allowed_roles)
@@ -0,0 +1,149 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.contrib.postgres.expressions import ArraySubquery
+
+from calyvim.models import Board, BoardPermission, WorkspaceMembership
+
+
+BOARD_ACCESS_TIMEOUT = 60
+
+
+def board_access_cache_key(user_id, board_id):
+    return f"board:{board_id}:access:{user_id}"
+
+
+def workspace_role_subquery(user_id, workspace_ref="workspace_id"):
+    return Subquery(
+        WorkspaceMembership.objects.filter(
+            workspace=OuterRef(workspace_ref), user_id=user_id
+        ).values("role")[:1]
+    )
+
+
+def board_roles_subquery(user_id, board_ref="pk"):
+    # A user can hold several permissions on a board, directly and via teams
+    return ArraySubquery(
+        BoardPermission.objects.filter(board=OuterRef(board_ref), user_id=user_id)
+        .values("role")
+        .distinct()
+    )
+
+
+class BoardAccess:
+    """
+    The roles a user holds on a board and its workspace.
+    """
+
+    def __init__(self, board, workspace_role=None, board_roles=()):
+        self.board = board
+        self.workspace_role = workspace_role
+        self.board_roles = set(board_roles or ())
+
+    @property
+    def is_workspace_member(self):
+        return self.workspace_role is not None
+
+    @property
+    def is_workspace_admin(self):
+        return self.workspace_role == WorkspaceMembership.Role.ADMIN
+
+    def has_workspace_role(self, allowed_roles):
+        return self.workspace_role in allowed_roles
+
+    def has_board_role(self, allowed_roles):
+        if not self.is_workspace_member:
+            return False
+        if self.is_workspace_admin:
+            return True
+        return bool(self.board_roles.intersection(allowed_roles))
+
+
+def get_board_roles(user_id, board):
+    """
+    `(workspace_role, board_roles)` of a user for an already loaded board,
+    served from a short lived per (user, board) cache.
+    """
+    key = board_access_cache_key(user_id, board.id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = (
+            Board.objects.filter(id=board.id)
+            .annotate(
+                workspace_role=workspace_role_subquery(user_id),
+                board_roles=board_roles_subquery(user_id),
+            )
+            .values_list("workspace_role", "board_roles")
+            .first()
+        )
+        cache.set(key, roles, timeout=BOARD_ACCESS_TIMEOUT)
+    return roles or (None, ())
+
+
+def resolve_board_access(request, board_id):
+    """
+    Load a board with its workspace and the request user's workspace and
+    board roles, memoized on the request.
+
+    On a cold role cache this is a single query; the board and the roles are
+    fetched together with subqueries. Returns None when the board does not
+    exist.
+    """
+    resolved = getattr(request, "_board_access", None)
+    if resolved is None:
+        resolved = request._board_access = {}
+    if board_id in resolved:
+        return resolved[board_id]
+
+    user_id = request.user.pk
+    key = board_access_cache_key(user_id, board_id)
+    queryset = Board.objects.select_related("workspace").filter(id=board_id)
+
+    roles = cache.get(key)
+    if roles is None:
+        board = queryset.annotate(
+            workspace_role=workspace_role_subquery(user_id),
+            board_roles=board_roles_subquery(user_id),
+        ).first()
+        if board is not None:
+            roles = (board.workspace_role, board.board_roles)
+            cache.set(key, roles, timeout=BOARD_ACCESS_TIMEOUT)
+    else:
+        board = queryset.first()
+
+    access = None
+    if board is not None:
+        access = BoardAccess(board, *roles)
+    resolved[board_id] = access
+    return access
+
+
+def get_board_access(request):
+    """
+    Access of the request user on `request.board`, resolved at most once per
+    request.
+    """
+    return resolve_board_access(request, request.board.id)
+
+
+def visible_board_ids(user_id, workspace_id):
+    """
+    Subquery of the ids of the workspace boards a member can open, the same
+    rule as `BoardAccess.has_board_role`: every board for workspace admins,
+    the boards with a permission for everyone else.
+    """
+    role = (
+        WorkspaceMembership.objects.filter(workspace_id=workspace_id, user_id=user_id)
+        .values_list("role", flat=True)
+        .first()
+    )
+    if role == WorkspaceMembership.Role.ADMIN:
+        return Board.objects.filter(workspace_id=workspace_id).values("id")
+    return BoardPermission.objects.filter(
+        user_id=user_id, board__workspace_id=workspace_id
+    ).values("board_id")
+
+
+def invalidate_board_access(user_id, board_ids):
+    keys = [board_access_cache_key(user_id, board_id) for board_id in board_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
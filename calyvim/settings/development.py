@@ -38,6 +38,12 @@ CACHES = {
     }
 }
 
+# Pub/sub for the realtime board events
+REALTIME_BROKER = {
+    "BACKEND": "calyvim.utils.realtime.RedisBroker",
+    "OPTIONS": {"url": os.environ.get("REDIS_URL", "redis://localhost:6379/0")},
+}
+
 if USE_S3:
     STORAGES = {
         "staticfiles": {
@@ -40,6 +40,12 @@ CACHES = {
     }
 }
 
+# Pub/sub for the realtime board events
+REALTIME_BROKER = {
+    "BACKEND": "calyvim.utils.realtime.RedisBroker",
+    "OPTIONS": {"url": os.environ.get("REDIS_URL")},
+}
+
 # Scout settings
 SCOUT_MONITOR = True
 SCOUT_KEY = os.environ.get("SCOUT_KEY")
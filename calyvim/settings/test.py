@@ -14,6 +14,9 @@ DJANGO_ALLOW_ASYNC_UNSAFE = True
 CELERY_BROKER_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.environ.get("REDIS_URL", "redis://localhost:6379/1")
 
+# Realtime board events stay in process
+REALTIME_BROKER = {"BACKEND": "calyvim.utils.realtime.InMemoryBroker"}
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "127.0.0.1"
 EMAIL_PORT = "1025"
@@ -1,7 +1,6 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.cache import cache
 from calyvim.models import (
     Board,
     BoardPermission,
@@ -11,7 +10,25 @@ from calyvim.models import (
     Estimate,
     Label,
     Sprint,
+    Task,
+    TaskLabel,
+    TaskAssignee,
+    User,
 )
+from calyvim.utils import bump_board_version_on_commit
+from calyvim.permissions import invalidate_board_access
+
+
+# User fields rendered in the board metadata members list and matched or
+# rendered by the member typeahead
+MEMBER_FIELDS = {
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "avatar",
+    "display_name",
+}
 
 
 @receiver(post_save, sender=Board)
@@ -98,15 +115,78 @@ def setup_initial_project(sender, instance, created, **kwargs):
             print("Template Board --> ", template_board)
 
 
+def invalidate_board_metadata(board_id):
+    # The metadata cache is keyed by the board version
+    bump_board_version_on_commit(board_id)
+
+
 @receiver([post_save, post_delete], sender=State)
 @receiver([post_save, post_delete], sender=Priority)
 @receiver([post_save, post_delete], sender=Estimate)
 @receiver([post_save, post_delete], sender=Label)
 @receiver([post_save, post_delete], sender=Sprint)
+@receiver([post_save, post_delete], sender=BoardPermission)
 def invalidate_board_metadata_cache(sender, instance, **kwargs):
-    if hasattr(instance, "board"):
-        board = instance.board
-    else:
-        board = instance
+    # Team and workspace membership changes reach the board members through
+    # the BoardPermission rows they create or cascade delete.
+    invalidate_board_metadata(instance.board_id)
+
+
+@receiver([post_save, post_delete], sender=BoardPermission)
+def invalidate_board_access_cache(sender, instance, **kwargs):
+    invalidate_board_access(instance.user_id, [instance.board_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_board_metadata_cache_on_profile_change(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if created:
+        return
+
+    if update_fields is not None and not set(update_fields) & MEMBER_FIELDS:
+        return
 
-    cache.delete(board.metadata_cache_key)
+    board_ids = (
+        BoardPermission.objects.filter(user=instance)
+        .values_list("board_id", flat=True)
+        .distinct()
+    )
+    for board_id in board_ids:
+        invalidate_board_metadata(board_id)
+
+
+@receiver([post_save, post_delete], sender=Task)
+def bump_board_version_on_task_change(sender, instance, **kwargs):
+    bump_board_version_on_commit(instance.board_id)
+
+
+@receiver([post_save, post_delete], sender=TaskLabel)
+@receiver([post_save, post_delete], sender=TaskAssignee)
+def bump_board_version_on_task_relation_change(sender, instance, **kwargs):
+    board_id = (
+        Task.all_objects.filter(id=instance.task_id)
+        .values_list("board_id", flat=True)
+        .first()
+    )
+    if board_id:
+        bump_board_version_on_commit(board_id)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+@receiver(m2m_changed, sender=Task.assignees.through)
+def bump_board_version_on_task_m2m_change(sender, instance, action, pk_set, **kwargs):
+    # add(), remove() and set() on the through models skip post_save
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    if isinstance(instance, Task):
+        board_ids = {instance.board_id}
+    else:
+        board_ids = set(
+            Task.all_objects.filter(id__in=pk_set or []).values_list(
+                "board_id", flat=True
+            )
+        )
+    for board_id in board_ids:
+        bump_board_version_on_commit(board_id)
@@ -1,6 +1,23 @@
-from django.db.models.signals import post_save
+from collections import defaultdict
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from calyvim.models import Task, TaskComment, TaskSnapshot
+from calyvim.models import (
+    Task,
+    TaskAssignee,
+    TaskComment,
+    TaskLabel,
+    TaskSnapshot,
+    TaskStateHistory,
+    UserTaskIndex,
+)
+from calyvim.tasks import schedule_sprint_stats_refresh
+from calyvim.api.tasks.events import (
+    TASK_UPDATED,
+    task_event_type,
+    publish_task_events,
+    publish_task_deleted,
+)
 
 
 @receiver(post_save, sender=Task)
@@ -20,3 +37,118 @@ def create_task_snapshot(sender, instance, created, **kwargs):
         TaskSnapshot.objects.create(
             task=instance, state=instance.state, date=instance.created_at
         )
+        if instance.state_id:
+            TaskStateHistory.objects.record(
+                [(instance.id, instance.board_id, instance.state_id)],
+                at=instance.created_at,
+            )
+
+
+@receiver([post_save, post_delete], sender=Task)
+def refresh_sprint_stats_on_task_change(sender, instance, **kwargs):
+    schedule_sprint_stats_refresh(instance.board_id)
+
+
+# Task fields that decide which users a task is indexed for
+USER_INDEX_FIELDS = {"assignee", "assignee_id", "created_by", "created_by_id"}
+
+
+@receiver(post_save, sender=Task)
+def sync_user_task_index(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or set(update_fields) & USER_INDEX_FIELDS:
+        UserTaskIndex.objects.sync([instance.id])
+        return
+
+    # Same users, only the denormalized ordering and visibility columns change
+    UserTaskIndex.objects.filter(task_id=instance.id).update(
+        task_updated_at=instance.updated_at, is_archived=instance.is_archived
+    )
+
+
+@receiver([post_save, post_delete], sender=TaskAssignee)
+def sync_user_task_index_on_assignee_change(sender, instance, **kwargs):
+    UserTaskIndex.objects.sync([instance.task_id])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def sync_user_task_index_on_assignees_m2m_change(
+    sender, instance, action, pk_set, **kwargs
+):
+    # add(), remove() and set() on the through model skip post_save
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    if isinstance(instance, Task):
+        UserTaskIndex.objects.sync([instance.id])
+    elif action == "post_clear":
+        # pk_set is not sent on clear, resync every task indexed for the user
+        UserTaskIndex.objects.sync(
+            UserTaskIndex.objects.filter(user=instance).values_list(
+                "task_id", flat=True
+            )
+        )
+    else:
+        UserTaskIndex.objects.sync(pk_set or [])
+
+
+# Task fields that make up the stored search vector
+SEARCH_FIELDS = {"name", "summary", "description", "description_raw"}
+
+
+@receiver(post_save, sender=Task)
+def refresh_task_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    # A full save also writes the in-memory (stale) search vector back
+    if created or update_fields is None or set(update_fields) & SEARCH_FIELDS:
+        Task.all_objects.filter(id=instance.id).refresh_search_vector()
+
+
+@receiver([post_save, post_delete], sender=TaskComment)
+def refresh_task_search_vector_on_comment_change(sender, instance, **kwargs):
+    if instance.comment_type == TaskComment.CommentType.UPDATE:
+        Task.all_objects.filter(id=instance.task_id).refresh_search_vector()
+
+
+@receiver(post_save, sender=Task)
+def publish_task_change(sender, instance, created, update_fields=None, **kwargs):
+    publish_task_events(
+        instance.board_id,
+        task_event_type(instance, created, update_fields),
+        [instance.id],
+    )
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deletion(sender, instance, **kwargs):
+    publish_task_deleted(instance.board_id, instance.id)
+
+
+@receiver([post_save, post_delete], sender=TaskLabel)
+@receiver([post_save, post_delete], sender=TaskAssignee)
+def publish_task_relation_change(sender, instance, **kwargs):
+    board_id = (
+        Task.all_objects.filter(id=instance.task_id)
+        .values_list("board_id", flat=True)
+        .first()
+    )
+    if board_id:
+        publish_task_events(board_id, TASK_UPDATED, [instance.task_id])
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+@receiver(m2m_changed, sender=Task.assignees.through)
+def publish_task_m2m_change(sender, instance, action, pk_set, **kwargs):
+    # add(), remove() and set() on the through models skip post_save
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    if isinstance(instance, Task):
+        publish_task_events(instance.board_id, TASK_UPDATED, [instance.id])
+        return
+
+    task_ids_by_board = defaultdict(list)
+    for task_id, board_id in Task.all_objects.filter(id__in=pk_set or []).values_list(
+        "id", "board_id"
+    ):
+        task_ids_by_board[board_id].append(task_id)
+    for board_id, task_ids in task_ids_by_board.items():
+        publish_task_events(board_id, TASK_UPDATED, task_ids)
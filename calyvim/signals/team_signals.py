@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from calyvim.models import TeamMembership, BoardTeamPermission, BoardPermission
+from calyvim.models import Team, TeamMembership, BoardTeamPermission, BoardPermission
+from calyvim.permissions import invalidate_board_access
+from calyvim.utils import bump_typeahead_version_on_commit
 
 
 @receiver(post_save, sender=TeamMembership)
@@ -32,6 +34,29 @@ def create_or_update_board_permission(sender, instance, created, **kwargs):
                 user=team_membership.user,
             )
     else:
-        BoardPermission.team_objects.filter(
+        team_board_permissions = BoardPermission.team_objects.filter(
             board=instance.board, team_permission=instance
-        ).update(role=instance.role)
+        )
+        user_ids = list(team_board_permissions.values_list("user_id", flat=True))
+        team_board_permissions.update(role=instance.role)
+
+        # update() skips the signals that clear the cached board roles
+        for user_id in user_ids:
+            invalidate_board_access(user_id, [instance.board_id])
+
+
+@receiver([post_save, post_delete], sender=Team)
+def invalidate_team_typeahead_cache(sender, instance, **kwargs):
+    bump_typeahead_version_on_commit(instance.workspace_id)
+
+
+@receiver([post_save, post_delete], sender=TeamMembership)
+def invalidate_team_typeahead_cache_on_membership_change(sender, instance, **kwargs):
+    # Team results render their members
+    workspace_id = (
+        Team.objects.filter(id=instance.team_id)
+        .values_list("workspace_id", flat=True)
+        .first()
+    )
+    if workspace_id:
+        bump_typeahead_version_on_commit(workspace_id)
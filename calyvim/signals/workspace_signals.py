@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from calyvim.models import Workspace, WorkspaceMembership
+from calyvim.models import Workspace, WorkspaceMembership, Board, User
+from calyvim.permissions import invalidate_board_access
+from calyvim.utils import bump_typeahead_version_on_commit
+from calyvim.signals.board_signals import MEMBER_FIELDS
 
 
 @receiver(post_save, sender=Workspace)
@@ -11,3 +14,33 @@ def create_default_workspace(sender, instance, created, **kwargs):
             user=instance.created_by,
             role=WorkspaceMembership.Role.ADMIN,
         )
+
+
+@receiver([post_save, post_delete], sender=WorkspaceMembership)
+def invalidate_workspace_board_access_cache(sender, instance, **kwargs):
+    board_ids = Board.objects.filter(workspace_id=instance.workspace_id).values_list(
+        "id", flat=True
+    )
+    invalidate_board_access(instance.user_id, board_ids)
+
+
+@receiver([post_save, post_delete], sender=WorkspaceMembership)
+def invalidate_member_typeahead_cache(sender, instance, **kwargs):
+    bump_typeahead_version_on_commit(instance.workspace_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_member_typeahead_cache_on_profile_change(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if created:
+        return
+
+    if update_fields is not None and not set(update_fields) & MEMBER_FIELDS:
+        return
+
+    workspace_ids = WorkspaceMembership.objects.filter(user=instance).values_list(
+        "workspace_id", flat=True
+    )
+    for workspace_id in workspace_ids:
+        bump_typeahead_version_on_commit(workspace_id)
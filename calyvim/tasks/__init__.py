@@ -1,3 +1,7 @@
 from calyvim.tasks.workspace import *
 from calyvim.tasks.accounts import *
 from calyvim.tasks.upload import *
+from calyvim.tasks.sequence import *
+from calyvim.tasks.sprint import *
+from calyvim.tasks.analytics import *
+from calyvim.tasks.changes import *
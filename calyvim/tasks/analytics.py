@@ -0,0 +1,14 @@
+from django.db import connection
+from celery import shared_task
+
+
+ANALYTICS_VIEWS = ("board_cumulative_flow", "task_flow_times")
+
+
+@shared_task
+def refresh_board_analytics():
+    # CONCURRENTLY keeps the views readable while they are rebuilt, it relies
+    # on the unique index every view has.
+    with connection.cursor() as cursor:
+        for view in ANALYTICS_VIEWS:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
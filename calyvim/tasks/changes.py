@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from celery import shared_task
+
+from calyvim.models import TaskChange
+
+
+# Also the lifetime of the task changes feed tokens
+CHANGE_LOG_RETENTION_DAYS = 7
+
+
+@shared_task
+def prune_task_changes():
+    cutoff = timezone.now() - timedelta(days=CHANGE_LOG_RETENTION_DAYS)
+    TaskChange.objects.filter(created_at__lt=cutoff).delete()
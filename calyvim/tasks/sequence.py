@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.db import transaction
+from celery import shared_task
+
+from calyvim.models import Task, State
+
+# Submodules, calyvim.utils imports calyvim.tasks through utils/files.py
+from calyvim.utils.ranking import rebalance_sequences
+from calyvim.utils.cache import bump_board_version
+
+
+# A burst of moves in the same column schedules a single rebalance
+REBALANCE_LOCK_TIMEOUT = 60
+
+
+@shared_task
+def rebalance_task_sequences(board_id, state_id):
+    with transaction.atomic():
+        rebalance_sequences(Task.objects.filter(board_id=board_id, state_id=state_id))
+    cache.delete(f"board:{board_id}:state:{state_id}:rebalance")
+    bump_board_version(board_id)
+
+
+@shared_task
+def rebalance_state_sequences(board_id):
+    with transaction.atomic():
+        rebalance_sequences(State.objects.filter(board_id=board_id))
+    cache.delete(f"board:{board_id}:states:rebalance")
+    # Also moves the board metadata, which holds the states, to a new key
+    bump_board_version(board_id)
+
+
+def schedule_task_rebalance(board_id, state_id):
+    if cache.add(
+        f"board:{board_id}:state:{state_id}:rebalance",
+        1,
+        timeout=REBALANCE_LOCK_TIMEOUT,
+    ):
+        transaction.on_commit(
+            lambda: rebalance_task_sequences.delay(str(board_id), str(state_id))
+        )
+
+
+def schedule_state_rebalance(board_id):
+    if cache.add(
+        f"board:{board_id}:states:rebalance", 1, timeout=REBALANCE_LOCK_TIMEOUT
+    ):
+        transaction.on_commit(lambda: rebalance_state_sequences.delay(str(board_id)))
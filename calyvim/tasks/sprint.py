@@ -0,0 +1,213 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from celery import shared_task
+
+from calyvim.models import Sprint, SprintDailyStat, State, Task, TaskSnapshot
+
+
+STAT_FIELDS = [
+    "total_count",
+    "open_count",
+    "active_count",
+    "completed_count",
+    "total_estimate",
+    "completed_estimate",
+]
+
+# Task writes within this window share a single refresh of today's rollup
+STATS_REFRESH_LOCK_TIMEOUT = 30
+
+# Reads of a sprint with missing rollup days within this window share a
+# single rebuild
+STATS_REBUILD_LOCK_TIMEOUT = 300
+
+
+def stats_refresh_lock_key(board_id):
+    return f"board:{board_id}:sprint-stats:refresh"
+
+
+def stats_rebuild_lock_key(sprint_id):
+    return f"sprint:{sprint_id}:stats:rebuild"
+
+
+# Hours per estimate unit, the default estimates are "1h" to "4d"
+ESTIMATE_UNIT_HOURS = {"h": 1, "d": 8, "w": 40}
+
+
+def parse_estimate(value):
+    # Estimates are free form, summed in hours, plain numbers are taken as is
+    value = (value or "").strip().lower()
+    hours = ESTIMATE_UNIT_HOURS.get(value[-1:])
+    if hours is not None:
+        value = value[:-1]
+    try:
+        return float(value) * (hours or 1)
+    except ValueError:
+        return 0
+
+
+def empty_stat():
+    return dict.fromkeys(STAT_FIELDS, 0)
+
+
+def add_to_stat(stat, category, estimate):
+    estimate = parse_estimate(estimate)
+    stat["total_count"] += 1
+    stat["total_estimate"] += estimate
+    match category:
+        case State.Category.COMPLETED:
+            stat["completed_count"] += 1
+            stat["completed_estimate"] += estimate
+        case State.Category.ACTIVE:
+            stat["active_count"] += 1
+        case _:
+            stat["open_count"] += 1
+
+
+def sprint_days(sprint, until):
+    day = sprint.start_date
+    while day <= min(sprint.end_date, until):
+        yield day
+        day += timedelta(days=1)
+
+
+def compute_current_stats(sprint_ids, date):
+    """
+    `{(sprint_id, date): stat}` from the current state of the sprint tasks.
+    """
+    stats = {(sprint_id, date): empty_stat() for sprint_id in sprint_ids}
+    rows = Task.objects.filter(sprint_id__in=sprint_ids).values_list(
+        "sprint_id", "state__category", "estimate__value"
+    )
+    for sprint_id, category, estimate in rows:
+        add_to_stat(stats[(sprint_id, date)], category, estimate)
+    return stats
+
+
+def compute_history_stats(sprint, until):
+    """
+    `{(sprint_id, date): stat}` for every sprint day up to `until`, replayed
+    from the task snapshots. A task counts from its first snapshot on, in the
+    state of its latest snapshot on or before each day.
+    """
+    tasks = Task.objects.filter(sprint=sprint)
+    estimates = dict(tasks.values_list("id", "estimate__value"))
+    snapshots = (
+        TaskSnapshot.objects.filter(task__in=tasks.values("id"), date__lte=until)
+        .order_by("date")
+        .values_list("task_id", "date", "state__category")
+    )
+
+    categories = {}
+    snapshots = iter(snapshots)
+    pending = next(snapshots, None)
+    stats = {}
+    for day in sprint_days(sprint, until):
+        while pending is not None and pending[1] <= day:
+            task_id, _, category = pending
+            categories[task_id] = category
+            pending = next(snapshots, None)
+
+        stat = empty_stat()
+        for task_id, category in categories.items():
+            add_to_stat(stat, category, estimates[task_id])
+        stats[(sprint.id, day)] = stat
+    return stats
+
+
+def save_sprint_stats(stats):
+    SprintDailyStat.objects.bulk_create(
+        [
+            SprintDailyStat(sprint_id=sprint_id, date=date, **stat)
+            for (sprint_id, date), stat in stats.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["sprint", "date"],
+        update_fields=STAT_FIELDS,
+    )
+
+
+def rebuild_sprint_stats(sprint):
+    """
+    Rebuilds every day of a sprint up to today: past days from the
+    snapshots, today from the current task states.
+    """
+    today = timezone.now().date()
+    stats = compute_history_stats(sprint, today - timedelta(days=1))
+    if sprint.start_date <= today <= sprint.end_date:
+        stats.update(compute_current_stats([sprint.id], today))
+    save_sprint_stats(stats)
+
+
+def get_sprint_daily_stats(sprint):
+    """
+    Daily rollup rows of a sprint. When days are missing (e.g. sprints that
+    ran before the rollup existed) a rebuild is scheduled and the rows there
+    are returned meanwhile.
+    """
+    today = timezone.now().date()
+    stats = list(sprint.daily_stats.all())
+    if len(stats) < len(list(sprint_days(sprint, today))):
+        schedule_sprint_stats_rebuild(sprint.board_id, [sprint.id])
+    return stats
+
+
+@shared_task
+def refresh_sprint_daily_stats(board_id, rebuild_sprint_ids=()):
+    """
+    Refreshes today's rollup of the running sprints of a board, after fully
+    rebuilding the sprints in `rebuild_sprint_ids` from the snapshots.
+    """
+    for sprint in Sprint.objects.filter(board_id=board_id, id__in=rebuild_sprint_ids):
+        with transaction.atomic():
+            rebuild_sprint_stats(sprint)
+        cache.delete(stats_rebuild_lock_key(sprint.id))
+
+    # Released first, writes landing during the refresh schedule another one
+    cache.delete(stats_refresh_lock_key(board_id))
+
+    today = timezone.now().date()
+    sprint_ids = list(
+        Sprint.objects.filter(
+            board_id=board_id, start_date__lte=today, end_date__gte=today
+        ).values_list("id", flat=True)
+    )
+    if sprint_ids:
+        save_sprint_stats(compute_current_stats(sprint_ids, today))
+
+
+@shared_task
+def reconcile_sprint_daily_stats():
+    """
+    Nightly: rebuilds the sprints that ran yesterday from the snapshots, which
+    also fills days without any task activity.
+    """
+    yesterday = timezone.now().date() - timedelta(days=1)
+    sprints = Sprint.objects.filter(start_date__lte=yesterday, end_date__gte=yesterday)
+    for sprint in sprints:
+        with transaction.atomic():
+            rebuild_sprint_stats(sprint)
+
+
+def schedule_sprint_stats_refresh(board_id):
+    if cache.add(
+        stats_refresh_lock_key(board_id), 1, timeout=STATS_REFRESH_LOCK_TIMEOUT
+    ):
+        transaction.on_commit(lambda: refresh_sprint_daily_stats.delay(str(board_id)))
+
+
+def schedule_sprint_stats_rebuild(board_id, sprint_ids):
+    sprint_ids = [
+        str(sprint_id)
+        for sprint_id in sprint_ids
+        if cache.add(
+            stats_rebuild_lock_key(sprint_id), 1, timeout=STATS_REBUILD_LOCK_TIMEOUT
+        )
+    ]
+    if sprint_ids:
+        transaction.on_commit(
+            lambda: refresh_sprint_daily_stats.delay(str(board_id), sprint_ids)
+        )
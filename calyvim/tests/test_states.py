@@ -0,0 +1,52 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from calyvim.models import Board, State, User, Workspace
+
+
+class StateSequenceUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username="owner", email="owner@example.com", first_name="Owner"
+        )
+        workspace = Workspace.objects.create(name="Acme", created_by=cls.user)
+        cls.board = Board.objects.create(
+            workspace=workspace, name="Roadmap", created_by=cls.user
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def update_sequence(self, state, data):
+        url = reverse(
+            "state-update-sequence",
+            kwargs={"board_id": self.board.id, "pk": state.id},
+        )
+        return self.client.patch(url, data, format="json")
+
+    def test_empty_body_keeps_sequence(self):
+        state = State.objects.get(board=self.board, name="In-progress")
+
+        response = self.update_sequence(state, {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["new_sequence"], 30000)
+        state.refresh_from_db()
+        self.assertEqual(state.sequence, 30000)
+
+    def test_moves_between_neighbours(self):
+        states = {state.name: state for state in State.objects.filter(board=self.board)}
+
+        response = self.update_sequence(
+            states["Done"],
+            {
+                "previous_state": str(states["Backlog"].id),
+                "next_state": str(states["Todo"].id),
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["new_sequence"], 15000)
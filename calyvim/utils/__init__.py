@@ -1,2 +1,8 @@
 from .files import *
-from .api import *
\ No newline at end of file
+from .api import *
+from .pagination import *
+from .cache import *
+from .ranking import *
+from .search import *
+from .typeahead import *
+from .realtime import *
@@ -1,4 +1,6 @@
+import json
 from rest_framework.exceptions import NotFound
+from django.core.serializers.json import DjangoJSONEncoder
 from django.shortcuts import get_object_or_404
 
 
@@ -18,3 +20,40 @@ def get_object_or_raise_api_404(klass, *args, message="Resource not found", **kw
         return get_object_or_404(klass, *args, **kwargs)
     except Exception:
         raise NotFound(detail=message)
+
+
+def stream_json_results(chunks, extra=None):
+    """
+    Yield a `{"results": [...]}` JSON document piece by piece.
+
+    Parameters:
+    - chunks: An iterable of lists of already serialized rows.
+    - extra: Optional dict of additional top level keys.
+
+    Only one chunk is held in memory at a time, so the response size does not
+    affect worker memory.
+    """
+    yield '{"results": ['
+    separator = ""
+    for rows in chunks:
+        if not rows:
+            continue
+        yield separator + ",".join(
+            json.dumps(row, cls=DjangoJSONEncoder) for row in rows
+        )
+        separator = ","
+    yield "]"
+    for key, value in (extra or {}).items():
+        yield f", {json.dumps(key)}: {json.dumps(value, cls=DjangoJSONEncoder)}"
+    yield "}"
+
+
+def iterate_in_chunks(iterable, chunk_size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
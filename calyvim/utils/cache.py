@@ -0,0 +1,153 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+BOARD_SNAPSHOT_TIMEOUT = 60 * 60
+REBUILD_LOCK_TIMEOUT = 10
+REBUILD_POLL_INTERVAL = 0.05
+# Waiting blocks a request thread, past this waiters build the value themselves
+REBUILD_WAIT_TIMEOUT = 0.5
+
+
+def get_or_build(key, build, timeout=None):
+    """
+    Read-through cache with stampede protection.
+
+    On a miss only the caller that wins the `add()` on the lock key rebuilds
+    the value; concurrent callers briefly poll for its result instead of
+    running the same rebuild, and build it themselves if the lock holder takes
+    longer than `REBUILD_WAIT_TIMEOUT`.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=REBUILD_LOCK_TIMEOUT):
+        try:
+            value = build()
+            cache.set(key, value, timeout=timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + REBUILD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return build()
+
+
+def board_version_cache_key(board_id):
+    return f"board:{board_id}:version"
+
+
+def get_board_version(board_id):
+    """
+    Current version of everything rendered for a board (tasks, states,
+    priorities, labels, sprints, estimates).
+
+    Versions start from the current time in milliseconds, so a counter that got
+    evicted never comes back with a value that was already handed out.
+    """
+    key = board_version_cache_key(board_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_board_version(board_id):
+    key = board_version_cache_key(board_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Counter missing or evicted, start a fresh one
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        return cache.get(key)
+
+
+def bump_board_version_on_commit(board_id):
+    # Bumping before the commit would let a concurrent reader cache the old
+    # rows under the new version.
+    transaction.on_commit(lambda: bump_board_version(board_id))
+
+
+class BoardSnapshot:
+    """
+    Versioned response cache for a board scoped request.
+
+    The ETag and the cache key are derived from the board version plus the
+    request path and query params, so any write to the board moves every
+    snapshot to a new key and nothing has to be deleted explicitly.
+    """
+
+    def __init__(self, request, board_id):
+        self.request = request
+        self.board_id = board_id
+        self.version = get_board_version(board_id)
+
+        query = sorted(request.query_params.lists())
+        digest = hashlib.md5(
+            f"{request.path}?{query}:{self.version}".encode()
+        ).hexdigest()
+        self.etag = quote_etag(digest)
+        self.cache_key = f"board:{board_id}:snapshot:{digest}"
+
+    def is_not_modified(self):
+        if_none_match = self.request.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        return "*" in etags or self.etag in etags
+
+    def get(self):
+        return cache.get(self.cache_key)
+
+    def set(self, data):
+        cache.set(self.cache_key, data, timeout=BOARD_SNAPSHOT_TIMEOUT)
+
+    def not_modified_response(self):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = self.etag
+        return response
+
+    def response(self, data):
+        response = Response(data, status=status.HTTP_200_OK)
+        response["ETag"] = self.etag
+        return response
+
+
+def cache_board_snapshot(view_method):
+    """
+    Serve a board scoped read action from the versioned snapshot cache and
+    answer `If-None-Match` with 304. Expects `request.board` to be set.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        snapshot = BoardSnapshot(request, request.board.id)
+        if snapshot.is_not_modified():
+            return snapshot.not_modified_response()
+
+        data = snapshot.get()
+        if data is not None:
+            return snapshot.response(data)
+
+        response = view_method(self, request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            snapshot.set(response.data)
+            response["ETag"] = snapshot.etag
+        return response
+
+    return wrapper
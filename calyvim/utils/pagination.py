@@ -0,0 +1,115 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from calyvim.exceptions import InvalidInputException
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def get_page_size(request, default=None):
+    """
+    Read the `limit` query param. Returns `default` when it is not given so
+    callers can keep their unpaginated behaviour.
+    """
+    limit = request.query_params.get("limit")
+    if limit is None:
+        return default
+
+    try:
+        page_size = int(limit)
+    except ValueError:
+        raise InvalidInputException
+
+    if page_size < 1:
+        raise InvalidInputException
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over a fixed, unique ordering (e.g. `("sequence", "id")`).
+
+    The cursor encodes the ordering values of the last row of a page, so the
+    next page is fetched with a range filter instead of an OFFSET and costs the
+    same no matter how deep the client pages.
+    """
+
+    def __init__(self, ordering, page_size=DEFAULT_PAGE_SIZE):
+        self.ordering = ordering
+        self.page_size = page_size
+
+    @property
+    def field_names(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def encode_cursor(self, row):
+        values = []
+        for name in self.field_names:
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if isinstance(value, (datetime.datetime, datetime.date)):
+                value = value.isoformat()
+            elif not isinstance(value, (int, float)):
+                value = str(value)
+            values.append(value)
+        payload = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor, model):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise InvalidInputException
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidInputException
+
+        # Cursors come from the client, every value is validated against its
+        # field so a tampered one is a 400 and not an error in the query
+        try:
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.field_names, values)
+            ]
+        except (ValidationError, TypeError):
+            raise InvalidInputException
+
+        if None in values:
+            raise InvalidInputException
+        return values
+
+    def get_keyset_filter(self, values):
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{name}__{lookup}": values[index]})
+            for previous_name, previous_value in zip(
+                self.field_names[:index], values[:index]
+            ):
+                term &= Q(**{previous_name: previous_value})
+            condition |= term
+        return condition
+
+    def paginate(self, queryset, cursor=None):
+        """
+        Returns `(rows, next_cursor)`. `next_cursor` is None on the last page.
+        """
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(
+                self.get_keyset_filter(self.decode_cursor(cursor, queryset.model))
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        if len(rows) <= self.page_size:
+            return rows, None
+
+        rows = rows[: self.page_size]
+        return rows, self.encode_cursor(rows[-1])
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+SEQUENCE_STEP = 10000
+
+# Once two neighbours are closer than this the column is renumbered in the
+# background, long before float precision runs out (~1e-12 relative).
+REBALANCE_GAP = 1.0
+
+
+def sequence_between(previous_sequence=None, next_sequence=None):
+    """
+    Sequence for an item dropped between two neighbours, either of which may
+    be missing when it is dropped at the start or the end of a list.
+    """
+    if previous_sequence is not None and next_sequence is not None:
+        return (previous_sequence + next_sequence) / 2
+    if previous_sequence is not None:
+        return previous_sequence + SEQUENCE_STEP
+    if next_sequence is not None:
+        return next_sequence - SEQUENCE_STEP
+    return SEQUENCE_STEP
+
+
+def has_sequence_collision(sequence, previous_sequence=None, next_sequence=None):
+    # The midpoint rounded onto one of its neighbours, the order is ambiguous
+    return sequence in (previous_sequence, next_sequence)
+
+
+def needs_rebalance(sequence, previous_sequence=None, next_sequence=None):
+    gaps = [
+        abs(sequence - neighbour)
+        for neighbour in (previous_sequence, next_sequence)
+        if neighbour is not None
+    ]
+    return bool(gaps) and min(gaps) < REBALANCE_GAP
+
+
+def rebalance_sequences(queryset, ordering=("sequence", "id")):
+    """
+    Renumbers the rows of `queryset` to `SEQUENCE_STEP` apart, keeping their
+    current order, with a single UPDATE ... FROM (ROW_NUMBER() ...) statement.
+    Returns the number of rows updated.
+    """
+    model = queryset.model
+    table = model._meta.db_table
+    ranked = (
+        queryset.order_by()
+        .annotate(
+            position=Window(
+                expression=RowNumber(),
+                order_by=[F(field).asc() for field in ordering],
+            )
+        )
+        .values("id", "position")
+    )
+    ranked_sql, params = ranked.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET sequence = ranked.position * %s "
+            f"FROM ({ranked_sql}) AS ranked WHERE {table}.id = ranked.id",
+            [SEQUENCE_STEP, *params],
+        )
+        return cursor.rowcount
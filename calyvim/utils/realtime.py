@@ -0,0 +1,151 @@
+import asyncio
+import json
+from collections import defaultdict
+from functools import cache as memoize
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+# Messages buffered per subscriber before it is told to resync instead
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Sent to a subscriber that fell behind, the client refetches the board
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+
+class InMemoryBroker:
+    """
+    Process local pub/sub. Publishers may run in any thread (sync views run
+    in a thread pool under ASGI), subscribers are async iterators consumed on
+    their own event loop.
+    """
+
+    def __init__(self, **options):
+        self.subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        # get() so channels without subscribers do not leave empty entries
+        for loop, queue in list(self.subscribers.get(channel, ())):
+            loop.call_soon_threadsafe(self.enqueue, queue, message)
+
+    @staticmethod
+    def enqueue(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Dropping events silently would leave the client with a wrong
+            # board, replace the backlog with a single resync
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_MESSAGE)
+
+    async def on_subscribe(self, channel):
+        pass
+
+    async def on_unsubscribe(self, channel):
+        pass
+
+    async def subscribe(self, channel, heartbeat=None):
+        """
+        Messages published to `channel` from now on. With `heartbeat` set,
+        None is yielded whenever nothing arrived for that many seconds so
+        long lived streams can keep their connection alive.
+        """
+        subscriber = (
+            asyncio.get_running_loop(),
+            asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE),
+        )
+        first = not self.subscribers[channel]
+        self.subscribers[channel].add(subscriber)
+        try:
+            if first:
+                await self.on_subscribe(channel)
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.subscribers[channel].discard(subscriber)
+            if not self.subscribers[channel]:
+                del self.subscribers[channel]
+                await self.on_unsubscribe(channel)
+
+
+class RedisBroker(InMemoryBroker):
+    """
+    Redis pub/sub across processes. Each process holds one Redis subscription
+    per channel with local subscribers and fans the messages out in memory, so
+    connected clients do not cost a Redis connection each.
+    """
+
+    def __init__(self, url, **options):
+        super().__init__(**options)
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self.pubsub = None
+        self.reader = None
+
+    def publish(self, channel, message):
+        try:
+            self.client.publish(channel, message)
+        except redis.RedisError:
+            # Delivery is best effort and must not fail a committed write,
+            # clients catch up from the board when they reconnect
+            pass
+
+    async def on_subscribe(self, channel):
+        if self.pubsub is None:
+            self.pubsub = redis.asyncio.Redis.from_url(self.url).pubsub()
+        await self.pubsub.subscribe(channel)
+        if self.reader is None or self.reader.done():
+            self.reader = asyncio.create_task(self.read())
+
+    async def on_unsubscribe(self, channel):
+        await self.pubsub.unsubscribe(channel)
+
+    async def read(self):
+        # listen() returns once the last channel is unsubscribed
+        async for item in self.pubsub.listen():
+            if item["type"] == "message":
+                self.deliver(item["channel"].decode(), item["data"].decode())
+
+
+@memoize
+def get_broker():
+    config = getattr(settings, "REALTIME_BROKER", {})
+    backend = import_string(
+        config.get("BACKEND", "calyvim.utils.realtime.InMemoryBroker")
+    )
+    return backend(**config.get("OPTIONS", {}))
+
+
+def board_channel(board_id):
+    return f"board:{board_id}:events"
+
+
+def publish_board_event(board_id, event_type, **data):
+    message = json.dumps(
+        {
+            "type": event_type,
+            "board_id": board_id,
+            "at": timezone.now(),
+            **data,
+        },
+        cls=DjangoJSONEncoder,
+    )
+    get_broker().publish(board_channel(board_id), message)
+
+
+def publish_board_event_on_commit(board_id, event_type, **data):
+    # Clients must never see a change that gets rolled back
+    transaction.on_commit(lambda: publish_board_event(board_id, event_type, **data))
@@ -0,0 +1,26 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery
+
+
+# Longest query accepted, in terms
+MAX_SEARCH_TERMS = 8
+
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+
+def build_prefix_search_query(text, config="simple"):
+    """
+    `SearchQuery` matching every term of `text`, the last term as a prefix so
+    results show up while the user is still typing. Returns None when `text`
+    has no searchable terms.
+
+    Terms are reduced to word characters before being passed to
+    `to_tsquery`, user input never reaches the tsquery syntax.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(text or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+
+    terms[-1] = f"{terms[-1]}:*"
+    return SearchQuery(" & ".join(terms), search_type="raw", config=config)
@@ -0,0 +1,94 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.contrib.postgres.search import TrigramSimilarity
+
+from calyvim.utils.cache import get_or_build
+
+
+TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+MAX_TYPEAHEAD_QUERY_LENGTH = 64
+
+# Prefixes up to this length match most of a large workspace, so the trigram
+# index barely narrows them down. Their results are cached per workspace.
+CACHED_PREFIX_LENGTH = 3
+TYPEAHEAD_CACHE_TIMEOUT = 10 * 60
+
+
+def normalize_typeahead_query(query):
+    return " ".join((query or "").split()).lower()[:MAX_TYPEAHEAD_QUERY_LENGTH]
+
+
+def get_typeahead_limit(request):
+    try:
+        limit = int(request.query_params.get("limit", TYPEAHEAD_LIMIT))
+    except ValueError:
+        return TYPEAHEAD_LIMIT
+    return max(1, min(limit, MAX_TYPEAHEAD_LIMIT))
+
+
+def typeahead(queryset, fields, query, limit=TYPEAHEAD_LIMIT):
+    """
+    Up to `limit` rows of `queryset` with any of `fields` containing `query`,
+    most similar first.
+
+    The `icontains` filters are answered by the `gin_trgm_ops` indexes on
+    `UPPER(field)`, ranking uses the trigram similarity of the best field.
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": query})
+
+    similarities = [TrigramSimilarity(field, query) for field in fields]
+    similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return list(
+        queryset.filter(condition)
+        .annotate(similarity=similarity)
+        .order_by("-similarity", *fields)[:limit]
+    )
+
+
+def typeahead_version_cache_key(workspace_id):
+    return f"workspace:{workspace_id}:typeahead:version"
+
+
+def get_typeahead_version(workspace_id):
+    # Versions start from the current time, see get_board_version
+    key = typeahead_version_cache_key(workspace_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_typeahead_version(workspace_id):
+    key = typeahead_version_cache_key(workspace_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def bump_typeahead_version_on_commit(workspace_id):
+    transaction.on_commit(lambda: bump_typeahead_version(workspace_id))
+
+
+def cached_typeahead(workspace_id, scope, query, limit, build):
+    """
+    Serves short prefixes from a cache keyed by the workspace typeahead
+    version, which membership, team and profile changes bump. Longer queries
+    are selective enough to always go to the index.
+    """
+    if len(query) > CACHED_PREFIX_LENGTH:
+        return build()
+
+    digest = hashlib.md5(query.encode()).hexdigest()
+    version = get_typeahead_version(workspace_id)
+    key = f"workspace:{workspace_id}:typeahead:{version}:{scope}:{limit}:{digest}"
+    return get_or_build(key, build, timeout=TYPEAHEAD_CACHE_TIMEOUT)